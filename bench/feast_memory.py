@@ -0,0 +1,73 @@
+'''
+memory taken by built calendars
+
+Traces the allocations of fifty built years (2000-2049) as LiturgicalDay
+keeps them, with and without their boundary tables, and of the same
+feasts held the way they were before Feast records: a dict per feast in
+the name index, and lists of those dicts in the date index.
+
+    python bench/feast_memory.py [first_year] [years]
+'''
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from doc.daily_office import ABSENT, LiturgicalDay
+
+
+def dict_layout(calendar):
+    '''
+    the calendar's feasts as one dict per feast, indexed by name and by
+    date, with the sorted ordinals of the dates
+    '''
+    names = {}
+    dates = {}
+    for key, feast in dict.items(calendar):
+        names[key] = record = {'name': feast.name, 'date': feast.date}
+        if feast.evening:
+            record['evening'] = True
+        if record['date'] is not ABSENT:
+            dates.setdefault(record['date'], []).append(record)
+    return names, dates, sorted(day.toordinal() for day in dates)
+
+
+def traced(build):
+    '''
+    returns the bytes still allocated by build's result, and the result
+    '''
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def main(first_year=2000, years=50):
+    span = range(first_year, first_year + years)
+    # build one year first, so lazily created module state is not counted
+    LiturgicalDay(first_year).tables
+
+    size, calendars = traced(lambda: [LiturgicalDay(year) for year in span])
+    print('Feast records:    {:6.1f} KiB/year'.format(size / 1024 / years))
+
+    tracemalloc.start()
+    before, peak = tracemalloc.get_traced_memory()
+    for calendar in calendars:
+        calendar.tables
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('  with tables:    {:6.1f} KiB/year'.format((size + after - before) / 1024 / years))
+
+    size, layouts = traced(lambda: [dict_layout(calendar) for calendar in calendars])
+    print('dict per feast:   {:6.1f} KiB/year'.format(size / 1024 / years))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
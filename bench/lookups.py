@@ -0,0 +1,81 @@
+'''
+cost of LiturgicalDay key lookups
+
+Times one lookup of each kind of key LiturgicalDay accepts, through its
+fast paths and through the normalization it had before them (every string
+split and upper-cased, and parsed by dateutil unless it names a feast).
+
+    python bench/lookups.py [year]
+'''
+
+import os
+import sys
+import timeit
+from datetime import date, datetime
+
+from dateutil.parser import parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from doc.daily_office import LiturgicalDay
+
+CALLS = 2000
+
+
+def slow_key(calendar, key):
+    '''
+    the key normalization without fast paths
+    '''
+    if isinstance(key, str):
+        name_key = '_'.join(key.split()).upper()
+        if dict.__contains__(calendar, name_key):
+            return name_key
+        try:
+            return parse(key).date()
+        except (ValueError, OverflowError):
+            return name_key
+    elif isinstance(key, datetime):
+        return key.date()
+    elif isinstance(key, date):
+        return key
+    return datetime.utcfromtimestamp(key).date()
+
+
+def slow_get(calendar, key):
+    key = slow_key(calendar, key)
+    if isinstance(key, str):
+        return dict.get(calendar, key)
+    feasts = calendar.dates.get(key)
+    return feasts[-1] if feasts else None
+
+
+def per_call(function):
+    return min(timeit.repeat(function, number=CALLS, repeat=3)) / CALLS * 1e6
+
+
+def main(year=2019):
+    calendar = LiturgicalDay(year)
+    christmas = date(year, 12, 25)
+    keys = (
+        ("'CHRISTMAS_DAY'", 'CHRISTMAS_DAY'),
+        ("'christmas day'", 'christmas day'),
+        ('date', christmas),
+        ('datetime', datetime(year, 12, 25, 9)),
+        ("'{}'".format(christmas), christmas.isoformat()),
+        ("'{}T09:00:00'".format(christmas), '{}T09:00:00'.format(christmas)),
+        ("'Dec 25 {}'".format(year), 'Dec 25 {}'.format(year)),
+        ('int timestamp', int(datetime(year, 12, 25, 9).timestamp())),
+        ('float timestamp', datetime(year, 12, 25, 9).timestamp()),
+        ("missing 'PROPER_30'", 'PROPER_30'),
+    )
+    print('{:26} {:>10} {:>10}'.format('key', 'before us', 'after us'))
+    for label, key in keys:
+        if calendar.get(key) != slow_get(calendar, key):
+            raise SystemExit('the lookups disagree on {}'.format(label))
+        before = per_call(lambda: slow_get(calendar, key))
+        after = per_call(lambda: calendar.get(key))
+        print('{:26} {:10.2f} {:10.2f}'.format(label, before, after))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,82 @@
+'''
+time to build a calendar year
+
+Times Easter by computus against dateutil's easter, a year's feast dates
+from the compiled rule table against the same rules worked out one by one
+with relativedelta, the way feasts were dated before the table, and a
+whole LiturgicalDay. The relativedelta dates are checked against the
+table's before anything is timed.
+
+    python bench/year_build.py [first_year] [years]
+'''
+
+import os
+import sys
+import timeit
+
+from dateutil.easter import easter
+from dateutil.relativedelta import relativedelta, weekdays
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from doc.daily_office import RULES, LiturgicalDay, build_year, computus
+
+
+def rule_date(rule, easter_day):
+    when = rule.when
+    anchor = easter_day if when.month is None else easter_day.replace(month=when.month, day=when.day)
+    if when.nth:
+        anchor += relativedelta(days=when.days, weekday=weekdays[when.weekday](when.nth))
+    else:
+        anchor += relativedelta(days=when.days)
+    return anchor + relativedelta(days=when.then)
+
+
+def dateutil_year(year):
+    '''
+    the ordinal of each feast of the year, 0 when absent, worked out rule
+    by rule with dateutil
+    '''
+    easter_day = easter(year)
+    days = {rule.key: rule_date(rule, easter_day) for rule in RULES}
+    ordinals = {}
+    for rule in RULES:
+        day = days[rule.key]
+        if rule.absent_from is not None and day >= days[rule.absent_from]:
+            ordinals[rule.key] = 0
+        elif rule.absent_through is not None and day <= days[rule.absent_through]:
+            ordinals[rule.key] = 0
+        else:
+            ordinals[rule.key] = day.toordinal()
+    return ordinals
+
+
+def best(function, years, repeat=3):
+    '''
+    microseconds per year, best of repeat runs over the years
+    '''
+    def run():
+        for year in years:
+            function(year)
+    return min(timeit.repeat(run, number=1, repeat=repeat)) / len(years) * 1e6
+
+
+def main(first_year=1900, years=200):
+    span = range(first_year, first_year + years)
+    for year in span:
+        expected = {feast.key: feast.ordinal for feast in build_year(year)}
+        if dateutil_year(year) != expected:
+            raise SystemExit('the rule table and dateutil disagree in {}'.format(year))
+
+    print('Easter:')
+    print('  dateutil easter    {:8.2f} us'.format(best(easter, span)))
+    print('  computus           {:8.2f} us'.format(best(computus, span)))
+    print('feast dates:')
+    print('  relativedelta      {:8.2f} us'.format(best(dateutil_year, span)))
+    print('  build_year         {:8.2f} us'.format(best(build_year, span)))
+    print('calendar:')
+    print('  LiturgicalDay      {:8.2f} us'.format(best(LiturgicalDay, span)))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -1,5 +1,23 @@
+import logging
+import os
+
 from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 
 class DocConfig(AppConfig):
     name = 'doc'
+
+    def ready(self):
+        from doc.daily_office import DailyOffice
+        from doc.office_table import OfficeTable
+
+        path = getattr(settings, 'OFFICE_TABLE', None)
+        if path and os.path.exists(path):
+            try:
+                DailyOffice.table = OfficeTable(path)
+            except ValueError as e:
+                # a stale table is ignored; calendars are built as needed
+                logger.warning('Not using office table: %s', e)
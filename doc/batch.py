@@ -0,0 +1,161 @@
+'''
+Vectorized batch resolver
+
+Resolves cycle, season, week, day and hour codes for whole NumPy
+datetime64 arrays at once, using searchsorted against the per-year
+boundary tables. Requires numpy, which the site itself does not, so
+it is listed in requirements-batch.txt; DailyOffice stays the reference
+implementation for single instants.
+'''
+
+from calendar import day_name
+from datetime import datetime, timezone
+
+import numpy as np
+
+from doc.daily_office import HOURS, CalendarWindow, calendar_cache, observed
+
+EPOCH_ORDINAL = 719163  # date(1970, 1, 1).toordinal()
+
+DAY = 86400 * 10 ** 6
+EVENING = 15 * 3600 * 10 ** 6
+# an instant belongs to the nearest canonical hour, ties going to the
+# earlier one, so the hour changes just after each midpoint
+HOUR_CUTS = np.array([9 * 3600, 15 * 3600, 19 * 3600 + 1800], dtype='int64') * 10 ** 6
+
+
+class BatchResult:
+    '''
+    arrays of codes into strings, one entry per input instant
+    '''
+
+    FIELDS = ('cycle', 'season', 'week', 'day', 'hour')
+
+    def __init__(self, strings, **codes):
+        '''
+        initializes the class
+        '''
+        self.strings = tuple(strings)
+        for field in self.FIELDS:
+            setattr(self, field, codes[field])
+
+    def __len__(self):
+        return len(self.cycle)
+
+    def decode(self, field):
+        '''
+        returns an object array of the strings for one field
+        '''
+        return np.array(self.strings, dtype=object)[getattr(self, field)]
+
+
+def _offsets(seconds, tz):
+    '''
+    returns the UTC offset in seconds of tz at each epoch second, probing
+    once per day and bisecting to the second where the offset changes
+    '''
+    def offset(second):
+        moment = datetime.fromtimestamp(int(second), timezone.utc).astimezone(tz)
+        return int(moment.utcoffset().total_seconds())
+
+    if not len(seconds):
+        return np.empty(0, dtype='int64')
+    first = int(seconds.min()) // 86400 * 86400
+    last = int(seconds.max()) // 86400 * 86400 + 86400
+    changes = [first]
+    values = [offset(first)]
+    for day in range(first + 86400, last + 1, 86400):
+        value = offset(day)
+        if value != values[-1]:
+            low, high = day - 86400, day
+            while high - low > 1:
+                middle = (low + high) // 2
+                if offset(middle) == values[-1]:
+                    low = middle
+                else:
+                    high = middle
+            changes.append(high)
+            values.append(value)
+    index = np.searchsorted(np.array(changes, dtype='int64'), seconds, side='right') - 1
+    return np.array(values, dtype='int64')[index]
+
+
+def to_local(instants, tz):
+    '''
+    converts UTC datetime64 instants to naive local wall times in tz
+    '''
+    instants = np.asarray(instants, dtype='datetime64[us]')
+    micros = instants.astype('int64')
+    offsets = _offsets(micros // 10 ** 6, tz)
+    return (micros + offsets * 10 ** 6).astype('datetime64[us]')
+
+
+def resolve(times, tz=None, cache=calendar_cache):
+    '''
+    resolves an array of local wall times, or of UTC instants when tz is
+    given, returning a BatchResult
+    '''
+    if tz is None:
+        local = np.asarray(times, dtype='datetime64[us]')
+    else:
+        local = to_local(times, tz)
+    micros = local.astype('int64')
+    days = np.floor_divide(micros, DAY)
+    since_midnight = micros - days * DAY
+    ordinals = days + EPOCH_ORDINAL
+    evening = since_midnight > EVENING
+    years = local.astype('datetime64[Y]').astype('int64') + 1970
+
+    strings = []
+    interned = {}
+
+    def intern(value):
+        code = interned.get(value)
+        if code is None:
+            code = interned[value] = len(strings)
+            strings.append(value)
+        return code
+
+    def codes(labels):
+        return np.array([intern(label) for label in labels], dtype='int32')
+
+    hour = codes([name for moment, name in HOURS])[np.searchsorted(HOUR_CUTS, since_midnight, side='left')]
+    weekdays = codes(list(day_name))[(ordinals + 6) % 7]
+
+    cycle = np.empty(len(local), dtype='int32')
+    season = np.empty(len(local), dtype='int32')
+    week = np.empty(len(local), dtype='int32')
+    day = weekdays
+    window = None
+    for year in np.unique(years):
+        year = int(year)
+        rows = np.nonzero(years == year)[0]
+        if window is None:
+            window = CalendarWindow(year, cache)
+        elif year not in window.years:
+            window = window.slide(year)
+        calendar = window.get(year)
+        tables = calendar.tables
+        ordinal = ordinals[rows]
+        for out, boundaries in ((cycle, tables.cycle), (season, tables.season), (week, tables.week)):
+            starts = np.array(boundaries.starts, dtype='int64')
+            out[rows] = codes(boundaries.labels)[np.searchsorted(starts, ordinal, side='right') - 1]
+        eve = evening[rows]
+        season[rows[eve & (ordinal == tables.christmas_eve)]] = intern('Christmas Season')
+        season[rows[eve & (ordinal == tables.eve_of_epiphany)]] = intern('Epiphany Season')
+
+        # the feast observed on each date of the year, before and after the
+        # evening cutoff, as a name code or -1 for the weekday name
+        feast_ordinals = np.array(calendar.ordinals, dtype='int64')
+        if not len(feast_ordinals):
+            continue
+        observed_names = np.array([
+            [-1 if feast is None else intern(feast.name) for feast in (observed(feasts), observed(feasts, True))]
+            for feasts in calendar.entries
+        ], dtype='int32')
+        found = np.searchsorted(feast_ordinals, ordinal).clip(0, len(feast_ordinals) - 1)
+        names = observed_names[found, eve.astype('intp')]
+        hit = (feast_ordinals[found] == ordinal) & (names >= 0)
+        day[rows[hit]] = names[hit]
+
+    return BatchResult(strings, cycle=cycle, season=season, week=week, day=day, hour=hour)
@@ -0,0 +1,77 @@
+'''
+URL path converters for the canonical office pages
+'''
+
+from collections import OrderedDict
+from datetime import MAXYEAR, MINYEAR, date, time
+
+import pytz
+
+from doc.daily_office import HOURS
+
+# URL slugs of the canonical hours, in the order of HOURS
+HOUR_SLUGS = OrderedDict(zip(
+    ('morning', 'noonday', 'evening', 'compline'),
+    (start for start, name in HOURS),
+))
+
+
+class TimezoneConverter:
+    '''
+    an IANA timezone name such as America/New_York, spelt as the database
+    spells it, so that each page has one address
+    '''
+
+    regex = r'[A-Za-z][A-Za-z0-9_+\-]*(?:/[A-Za-z0-9_+\-]+){0,2}'
+
+    def to_python(self, value):
+        try:
+            tz = pytz.timezone(value)
+        except pytz.UnknownTimeZoneError:
+            raise ValueError(value)
+        # pytz finds zones whatever their case
+        if tz.zone != value:
+            raise ValueError(value)
+        return tz
+
+    def to_url(self, value):
+        return getattr(value, 'zone', value)
+
+
+class DateConverter:
+    '''
+    a date written yyyy-mm-dd; the first and last years are refused, as
+    an office needs the calendars of the years either side
+    '''
+
+    regex = r'\d{4}-\d{2}-\d{2}'
+
+    def to_python(self, value):
+        year = int(value[:4])
+        if not MINYEAR < year < MAXYEAR:
+            raise ValueError(value)
+        return date(year, int(value[5:7]), int(value[8:]))
+
+    def to_url(self, value):
+        if isinstance(value, date):
+            return '{:04d}-{:02d}-{:02d}'.format(value.year, value.month, value.day)
+        return value
+
+
+class HourConverter:
+    '''
+    the slug of a canonical hour, given to the view as its time of day
+    '''
+
+    regex = '|'.join(HOUR_SLUGS)
+
+    def to_python(self, value):
+        return HOUR_SLUGS[value]
+
+    def to_url(self, value):
+        if isinstance(value, time):
+            for slug, start in HOUR_SLUGS.items():
+                if start == value:
+                    return slug
+            raise ValueError(value)
+        return value
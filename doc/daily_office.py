@@ -2,1326 +2,1351 @@
 Daily Office Companion
 '''
 
-from calendar import day_name
-from dateutil.easter import easter
+import heapq
+import re
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from calendar import day_name, SUNDAY, THURSDAY
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from itertools import chain, islice
 from dateutil.parser import parse
-from dateutil.relativedelta import relativedelta as rd
-from dateutil.relativedelta import MO, TU, WE, TH, FR, SA, SU
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timedelta, timezone, MINYEAR, MAXYEAR
+
+ABSENT = date(1970, 1, 1)
+
+# bump whenever a change to the calendar alters resolved output; stored
+# in prebuilt office tables so stale ones are refused
+CALENDAR_VERSION = 4
+
+class Feast(namedtuple('Feast', 'key name ordinal evening tier transferred_from')):
+    '''
+    immutable record of one observance; ordinal is 0 when the feast does
+    not fall in the year, and tier 1 takes precedence over tier 6; a
+    feast moved off a day taken by a greater one, or the eve moved with
+    it, keeps the ordinal it fell on in transferred_from, which is
+    otherwise 0
+    '''
+
+    __slots__ = ()
+
+    @property
+    def transferred(self):
+        return bool(self.transferred_from)
+
+    @property
+    def date(self):
+        if not self.ordinal:
+            return ABSENT
+        return date.fromordinal(self.ordinal)
+
+    @property
+    def absent(self):
+        return not self.ordinal
+
+class DateRule(namedtuple('DateRule', 'month day days weekday nth then')):
+    '''
+    where a feast falls: an anchor (a fixed month and day, or Easter when
+    month is None), moved by days, then to the nth weekday on or after
+    (nth > 0) or on or before (nth < 0) that day, then moved by then
+    '''
+
+    __slots__ = ()
+
+def fixed(month, day, days=0, weekday=None, nth=0, then=0):
+    return DateRule(month, day, days, weekday, nth, then)
+
+def paschal(days=0, weekday=None, nth=0, then=0):
+    return DateRule(None, None, days, weekday, nth, then)
+
+class Rule:
+    '''
+    one row of the feast table; a feast is absent from the year when it
+    would fall on or after absent_from, or on or before absent_through;
+    an eve names the feast of the following day in eve_of, and moves with
+    it when it is transferred
+    '''
+
+    __slots__ = ('key', 'name', 'tier', 'when', 'evening', 'absent_from', 'absent_through', 'eve_of')
+
+    def __init__(self, key, name, tier, when, evening=False, absent_from=None, absent_through=None, eve_of=None):
+        '''
+        initializes the class
+        '''
+        self.key = key
+        self.name = name
+        self.tier = tier
+        self.when = when
+        self.evening = evening
+        self.absent_from = absent_from
+        self.absent_through = absent_through
+        self.eve_of = eve_of
+
+# feasts in order of entry; where two fall on one date, the later one
+# (the higher tier) takes precedence
+RULES = (
+
+    #============================Tier 6============================
+
+    Rule('EVE_OF_1_EPIPHANY', 'Eve of the Baptism of our Lord', 6, fixed(1, 6, days=1, weekday=SUNDAY, nth=1, then=-1), absent_from='LAST_SUNDAY_AFTER_EPIPHANY'),
+
+    #============================Tier 5============================
+
+    Rule('CONFESSION_OF_ST_PETER', 'The Confession of Saint Peter the Apostle', 5, fixed(1, 18)),
+    Rule('CONVERSION_OF_ST_PAUL', 'The Conversion of Saint Paul the Apostle', 5, fixed(1, 25)),
+    Rule('ST_MATTHIAS', 'Saint Matthias the Apostle', 5, fixed(2, 24)),
+    Rule('ST_JOSEPH', 'Saint Joseph', 5, fixed(3, 19)),
+    Rule('EVE_OF_THE_ANNUNCIATION', 'Eve of the Annunciation', 5, fixed(3, 24), evening=True, eve_of='THE_ANNUNCIATION'),
+    Rule('THE_ANNUNCIATION', 'The Annunciation of Our Lord Jesus Christ to the Blessed Virgin Mary', 5, fixed(3, 25)),
+    Rule('SS_PHILLIP_JAMES', 'Saint Mark the Evangelist', 5, fixed(4, 25)),
+    Rule('SS_PHILIP_JAMES', 'Saint Philip and Saint James, Apostles', 5, fixed(5, 1)),
+    Rule('EVE_OF_THE_VISITATION', 'Eve of the Visitation', 5, fixed(5, 30), evening=True, eve_of='THE_VISITATION'),
+    Rule('THE_VISITATION', 'The Visitation of the Blessed Virgin Mary', 5, fixed(5, 31)),
+    Rule('ST_BARNABAS', 'Saint Barnabas the Apostle', 5, fixed(6, 11)),
+    Rule('EVE_OF_ST_JOHN_THE_BAPTIST', 'Eve of Saint John the Baptist', 5, fixed(6, 23), evening=True, eve_of='ST_JOHN_THE_BAPTIST'),
+    Rule('ST_JOHN_THE_BAPTIST', 'The Nativity of Saint John the Baptist', 5, fixed(6, 24)),
+    Rule('SS_PETER_PAUL', 'Saint Peter and Saint Paul, Apostles', 5, fixed(6, 29)),
+    Rule('INDEPENDENCE_DAY', 'Independence Day', 5, fixed(7, 4)),
+    Rule('ST_MARY_MAGDALENE', 'Saint Mary Magdalene', 5, fixed(7, 22)),
+    Rule('ST_JAMES', 'Saint James the Apostle', 5, fixed(7, 25)),
+    Rule('ST_MARY_THE_VIRGIN', 'Saint Mary the Virgin, Mother of Our Lord Jesus Christ', 5, fixed(8, 15)),
+    Rule('ST_BARTHOLOMEW', 'Saint Bartholomew the Apostle', 5, fixed(8, 24)),
+    Rule('EVE_OF_HOLY_CROSS', 'Eve of Holy Cross', 5, fixed(9, 13), evening=True, eve_of='HOLY_CROSS_DAY'),
+    Rule('HOLY_CROSS_DAY', 'Holy Cross Day', 5, fixed(9, 14)),
+    Rule('ST_MATTHEW', 'Saint Matthew, Apostle and Evangelist', 5, fixed(9, 21)),
+    Rule('ST_MICHAEL_ALL_ANGELS', 'Saint Michael and All Angels', 5, fixed(9, 29)),
+    Rule('ST_LUKE', 'Saint Luke the Evangelist', 5, fixed(10, 18)),
+    Rule('ST_JAMES_OF_JERUSALEM', 'Saint James of Jerusalem, Brother of Our Lord Jesus Christ, and Martyr', 5, fixed(10, 23)),
+    Rule('SS_SIMON_JUDE', 'Saint Simon and Saint Jude, Apostles', 5, fixed(10, 28)),
+    Rule('THANKSGIVING_DAY', 'Thanksgiving Day', 5, fixed(11, 1, weekday=THURSDAY, nth=4)),
+    Rule('ST_ANDREW', 'Saint Andrew the Apostle', 5, fixed(11, 30)),
+    Rule('ST_THOMAS', 'Saint Thomas the Apostle', 5, fixed(12, 21)),
+    Rule('ST_STEPHEN', 'Saint Stephen, Deacon and Martyr', 5, fixed(12, 26)),
+    Rule('ST_JOHN', 'Saint John, Apostle and Evangelist', 5, fixed(12, 27)),
+    Rule('HOLY_INNOCENTS', 'The Holy Innocents', 5, fixed(12, 28)),
+
+    #============================Tier 4============================
+
+    Rule('ASH_WEDNESDAY', 'Ash Wednesday', 4, paschal(-46)),
+
+    #============================Tier 3============================
+
+    Rule('FIRST_SUNDAY_OF_ADVENT', 'First Sunday of Advent', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-4)),
+    Rule('SECOND_SUNDAY_OF_ADVENT', 'Second Sunday of Advent', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-3)),
+    Rule('THIRD_SUNDAY_OF_ADVENT', 'Third Sunday of Advent', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-2)),
+    Rule('FOURTH_SUNDAY_OF_ADVENT', 'Fourth Sunday of Advent', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-1)),
+    Rule('FIRST_SUNDAY_AFTER_CHRISTMAS', 'First Sunday after Christmas Day', 3, fixed(12, 25, days=1, weekday=SUNDAY, nth=1)),
+    Rule('SECOND_SUNDAY_AFTER_CHRISTMAS', 'Second Sunday after Christmas Day', 3, fixed(12, 25, days=1, weekday=SUNDAY, nth=2)),
+    Rule('FIRST_SUNDAY_AFTER_EPIPHANY', 'First Sunday after the Epiphany: The Baptism of our Lord', 3, fixed(1, 6, days=1, weekday=SUNDAY, nth=1), absent_from='LAST_SUNDAY_AFTER_EPIPHANY'),
+    Rule('SECOND_SUNDAY_AFTER_EPIPHANY', 'Second Sunday after the Epiphany', 3, fixed(1, 6, days=1, weekday=SUNDAY, nth=2), absent_from='LAST_SUNDAY_AFTER_EPIPHANY'),
+    Rule('THIRD_SUNDAY_AFTER_EPIPHANY', 'Third Sunday after the Epiphany', 3, fixed(1, 6, days=1, weekday=SUNDAY, nth=3), absent_from='LAST_SUNDAY_AFTER_EPIPHANY'),
+    Rule('FOURTH_SUNDAY_AFTER_EPIPHANY', 'Fourth Sunday after the Epiphany', 3, fixed(1, 6, days=1, weekday=SUNDAY, nth=4), absent_from='LAST_SUNDAY_AFTER_EPIPHANY'),
+    Rule('FIFTH_SUNDAY_AFTER_EPIPHANY', 'Fifth Sunday after the Epiphany', 3, fixed(1, 6, days=1, weekday=SUNDAY, nth=5), absent_from='LAST_SUNDAY_AFTER_EPIPHANY'),
+    Rule('SIXTH_SUNDAY_AFTER_EPIPHANY', 'Sixth day after the Epiphany', 3, fixed(1, 6, days=1, weekday=SUNDAY, nth=6), absent_from='LAST_SUNDAY_AFTER_EPIPHANY'),
+    Rule('SEVENTH_SUNDAY_AFTER_EPIPHANY', 'Seventh Sunday after the Epiphany', 3, fixed(1, 6, days=1, weekday=SUNDAY, nth=7), absent_from='LAST_SUNDAY_AFTER_EPIPHANY'),
+    Rule('EIGHTH_SUNDAY_AFTER_EPIPHANY', 'Eighth Sunday after the Epiphany', 3, fixed(1, 6, days=1, weekday=SUNDAY, nth=8), absent_from='LAST_SUNDAY_AFTER_EPIPHANY'),
+    Rule('LAST_SUNDAY_AFTER_EPIPHANY', 'Last Sunday after the Epiphany', 3, paschal(-46, weekday=SUNDAY, nth=-1)),
+    Rule('FIRST_SUNDAY_IN_LENT', 'First Sunday in Lent', 3, paschal(-45, weekday=SUNDAY, nth=1)),
+    Rule('SECOND_SUNDAY_IN_LENT', 'Second Sunday in Lent', 3, paschal(-45, weekday=SUNDAY, nth=2)),
+    Rule('THIRD_SUNDAY_IN_LENT', 'Third Sunday in Lent', 3, paschal(-45, weekday=SUNDAY, nth=3)),
+    Rule('FOURTH_SUNDAY_IN_LENT', 'Fourth Sunday in Lent', 3, paschal(-45, weekday=SUNDAY, nth=4)),
+    Rule('FIFTH_SUNDAY_IN_LENT', 'Fifth Sunday in Lent', 3, paschal(-45, weekday=SUNDAY, nth=5)),
+    Rule('PALM_SUNDAY', 'The Sunday of the Passion: Palm Sunday', 3, paschal(-7)),
+    Rule('SECOND_SUNDAY_OF_EASTER', 'Second Sunday of Easter', 3, paschal(1, weekday=SUNDAY, nth=1)),
+    Rule('THIRD_SUNDAY_OF_EASTER', 'Third Sunday of Easter', 3, paschal(1, weekday=SUNDAY, nth=2)),
+    Rule('FOURTH_SUNDAY_OF_EASTER', 'Fourth Sunday of Easter', 3, paschal(1, weekday=SUNDAY, nth=3)),
+    Rule('FIFTH_SUNDAY_OF_EASTER', 'Fifth Sunday of Easter', 3, paschal(1, weekday=SUNDAY, nth=4)),
+    Rule('SIXTH_SUNDAY_OF_EASTER', 'Sixth Sunday of Easter', 3, paschal(1, weekday=SUNDAY, nth=5)),
+    Rule('SEVENTH_SUNDAY_OF_EASTER', 'Seventh Sunday of Easter', 3, paschal(1, weekday=SUNDAY, nth=6)),
+    Rule('PROPER_3', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-31), absent_through='TRINITY_SUNDAY'),
+    Rule('PROPER_4', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-30), absent_through='TRINITY_SUNDAY'),
+    Rule('PROPER_5', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-29), absent_through='TRINITY_SUNDAY'),
+    Rule('PROPER_6', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-28), absent_through='TRINITY_SUNDAY'),
+    Rule('PROPER_7', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-27), absent_through='TRINITY_SUNDAY'),
+    Rule('PROPER_8', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-26), absent_through='TRINITY_SUNDAY'),
+    Rule('PROPER_9', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-25)),
+    Rule('PROPER_10', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-24)),
+    Rule('PROPER_11', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-23)),
+    Rule('PROPER_12', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-22)),
+    Rule('PROPER_13', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-21)),
+    Rule('PROPER_14', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-20)),
+    Rule('PROPER_15', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-19)),
+    Rule('PROPER_16', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-18)),
+    Rule('PROPER_17', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-17)),
+    Rule('PROPER_18', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-16)),
+    Rule('PROPER_19', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-15)),
+    Rule('PROPER_20', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-14)),
+    Rule('PROPER_21', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-13)),
+    Rule('PROPER_22', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-12)),
+    Rule('PROPER_23', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-11)),
+    Rule('PROPER_24', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-10)),
+    Rule('PROPER_25', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-9)),
+    Rule('PROPER_26', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-8)),
+    Rule('PROPER_27', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-7)),
+    Rule('PROPER_28', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-6)),
+    Rule('PROPER_29', 'Sunday', 3, fixed(12, 25, days=-1, weekday=SUNDAY, nth=-5)),
+
+    #============================Tier 2============================
+
+    Rule('THE_HOLY_NAME', 'The Holy Name of Our Lord Jesus Christ', 2, fixed(1, 1)),
+    Rule('EVE_OF_THE_PRESENTATION', 'Eve of the Presentation', 2, fixed(2, 1), evening=True, eve_of='THE_PRESENTATION'),
+    Rule('THE_PRESENTATION', 'The Presentation of Our Lord Jesus Christ in the Temple', 2, fixed(2, 2)),
+    Rule('EVE_OF_THE_TRANSFIGURATION', 'Eve of the Transfiguration', 2, fixed(8, 5), evening=True, eve_of='THE_TRANSFIGURATION'),
+    Rule('THE_TRANSFIGURATION', 'The Transfiguration of Our Lord Jesus Christ', 2, fixed(8, 6)),
+
+    #============================Tier 1============================
+
+    Rule('EVE_OF_EPIPHANY', 'Eve of Epiphany', 1, fixed(1, 5), evening=True, eve_of='THE_EPIPHANY'),
+    Rule('THE_EPIPHANY', 'The Epiphany of Our Lord Jesus Christ', 1, fixed(1, 6)),
+    Rule('EASTER_DAY', 'The Sunday of the Resurrection, or Easter Day', 1, paschal()),
+    Rule('EVE_OF_ASCENSION_DAY', 'Eve of Ascension Day', 1, paschal(38), evening=True, eve_of='ASCENSION_DAY'),
+    Rule('ASCENSION_DAY', 'Ascension Day', 1, paschal(39)),
+    Rule('EVE_OF_PENTECOST', 'Eve of Pentecost', 1, paschal(48), evening=True, eve_of='WHITSUNDAY'),
+    Rule('WHITSUNDAY', 'The Day of Pentecost: Whitsunday', 1, paschal(49)),
+    Rule('TRINITY_SUNDAY', 'The First Sunday after Pentecost: Trinity Sunday', 1, paschal(56)),
+    Rule('EVE_OF_ALL_SAINTS', 'Eve of All Saints', 1, fixed(10, 31), evening=True, eve_of='ALL_SAINTS_DAY'),
+    Rule('ALL_SAINTS_DAY', 'All Saints Day', 1, fixed(11, 1)),
+    Rule('CHRISTMAS_EVE', 'Christmas Eve', 1, fixed(12, 24), evening=True, eve_of='CHRISTMAS_DAY'),
+    Rule('CHRISTMAS_DAY', 'The Nativity of Our Lord Jesus Christ', 1, fixed(12, 25)),
+    Rule('EVE_OF_THE_HOLY_NAME', 'Eve of Holy Name', 1, fixed(12, 31), evening=True),
+)
+
+def new_year_ordinal(year):
+    '''
+    proleptic Gregorian ordinal of 1 January
+    '''
+    before = year - 1
+    return before * 365 + before // 4 - before // 100 + before // 400 + 1
+
+def computus(year):
+    '''
+    ordinal of Western Easter Day (the anonymous Gregorian algorithm)
+    '''
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    # days after 21 March; Easter falls from 22 March to 25 April
+    return date(year, 3, 21).toordinal() + h + l - 7 * m + 1
+
+# Easter Day ordinals for the Gregorian years dateutil also supports
+EASTER_FIRST_YEAR = 1583
+EASTER_LAST_YEAR = 4099
+EASTER_TABLE = tuple(computus(year) for year in range(EASTER_FIRST_YEAR, EASTER_LAST_YEAR + 1))
+
+def easter_ordinal(year):
+    '''
+    ordinal of Easter Day, from the table where it covers the year
+    '''
+    if EASTER_FIRST_YEAR <= year <= EASTER_LAST_YEAR:
+        return EASTER_TABLE[year - EASTER_FIRST_YEAR]
+    return computus(year)
+
+# day of the year each month starts on, in a common year
+_MONTH_STARTS = (None, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+def compile_rules(rules):
+    '''
+    compiles a feast table into a function building one year's feasts,
+    in table order, as Feast records
+
+    rules sharing an anchor, shift and weekday direction share one base
+    day per year (the Advent Sundays and the Propers are all whole weeks
+    before the Sunday on or before 24 December), so each feast is then a
+    single addition
+    '''
+    position = {rule.key: index for index, rule in enumerate(rules)}
+    bases = []
+    steps = []
+    for rule in rules:
+        when = rule.when
+        if when.month is None:
+            start, leap = None, 0
+        else:
+            start, leap = _MONTH_STARTS[when.month] + when.day - 1, int(when.month > 2)
+        direction = (when.nth > 0) - (when.nth < 0)
+        base = (start, leap, when.days, when.weekday if direction else None, direction)
+        if base not in bases:
+            bases.append(base)
+        weeks = 7 * (when.nth - direction)
+        if rule.absent_from is not None:
+            absent, reference = 1, position[rule.absent_from]
+        elif rule.absent_through is not None:
+            absent, reference = -1, position[rule.absent_through]
+        else:
+            absent, reference = 0, None
+        steps.append((
+            sys.intern(rule.key), sys.intern(rule.name), rule.evening, rule.tier,
+            bases.index(base), weeks + when.then, absent, reference,
+        ))
+    bases = tuple(bases)
+    steps = tuple(steps)
+    new = tuple.__new__
+
+    def build(year):
+        new_year = new_year_ordinal(year)
+        leap_day = int(year % 4 == 0 and (year % 100 != 0 or year % 400 == 0))
+        easter_day = easter_ordinal(year)
+        days = []
+        for start, leap, shift, weekday, direction in bases:
+            if start is None:
+                ordinal = easter_day + shift
+            else:
+                ordinal = new_year + start + leap * leap_day + shift
+            # ordinal 1 (1 Jan 1) was a Monday, weekday 0
+            if direction > 0:
+                ordinal += (weekday - ordinal - 6) % 7
+            elif direction < 0:
+                ordinal -= (ordinal + 6 - weekday) % 7
+            days.append(ordinal)
+        ordinals = [days[base] + offset for key, name, evening, tier, base, offset, absent, reference in steps]
+        feasts = []
+        for (key, name, evening, tier, base, offset, absent, reference), ordinal in zip(steps, ordinals):
+            if absent and (ordinal >= ordinals[reference] if absent > 0 else ordinal <= ordinals[reference]):
+                ordinal = 0
+            feasts.append(new(Feast, (key, name, ordinal, evening, tier, 0)))
+        return feasts
+
+    return build
+
+build_year = compile_rules(RULES)
+
+# displaced feasts of these tiers move to the next free day; Sundays,
+# eves and the rest stay where they fall and are commemorated there
+TRANSFERABLE_TIERS = frozenset((2, 5))
+
+EVES = {rule.eve_of: rule.key for rule in RULES if rule.eve_of}
+
+def precedence(position, feast):
+    '''
+    sort key ranking the feasts of one day, lowest first: by tier, and
+    between equal tiers the later entered
+    '''
+    return (-feast.tier, position)
+
+def observed(feasts, evening=False):
+    '''
+    returns the feast observed among those of one date, lowest precedence
+    first, or None; feasts kept only in the evening take precedence after
+    the evening cutoff and give way to the rest before it
+    '''
+    for feast in reversed(feasts):
+        if evening or not feast.evening:
+            return feast
+    return None
+
+def transfer_feasts(feasts):
+    '''
+    resolves the days on which several feasts fall, returning the feasts
+    with each displaced transferable one moved to the first following day
+    that holds no feast, and its eve to the evening before that day; an
+    eve kept only in the evening displaces nothing
+    '''
+    by_key = {feast.key: position for position, feast in enumerate(feasts)}
+    by_ordinal = {}
+    for position, feast in enumerate(feasts):
+        if feast.ordinal:
+            by_ordinal.setdefault(feast.ordinal, []).append(position)
+    resolved = list(feasts)
+    taken = set(by_ordinal)
+    for ordinal in sorted(by_ordinal):
+        # the day's own feasts contend for it; evening ones never move
+        positions = [position for position in by_ordinal[ordinal] if not feasts[position].evening]
+        if len(positions) < 2:
+            continue
+        winner = max(positions, key=lambda position: precedence(position, feasts[position]))
+        for position in positions:
+            feast = feasts[position]
+            if position == winner or feast.tier not in TRANSFERABLE_TIERS:
+                continue
+            target = ordinal + 1
+            while target in taken:
+                target += 1
+            taken.add(target)
+            resolved[position] = feast._replace(ordinal=target, transferred_from=ordinal)
+            eve = by_key.get(EVES.get(feast.key))
+            if eve is not None and feasts[eve].ordinal == ordinal - 1:
+                resolved[eve] = feasts[eve]._replace(ordinal=target - 1, transferred_from=ordinal - 1)
+    return resolved
+
+FEAST_KEYS = frozenset(rule.key for rule in RULES)
+
+# an ISO-8601 date, alone or with a time of day and UTC offset
+_ISO_DATE = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[T ](\d{2})(?::(\d{2})(?::(\d{2})(?:[.,]\d+)?)?)?(?:Z|[+-]\d{2}(?::?\d{2})?)?)?$'
+)
+
+# marks strings only dateutil can read; those may be relative to today
+# ('monday', 'Dec 25') so their dates are not memoized
+_FREE_FORM = object()
+
+@lru_cache(maxsize=1024)
+def _memo_key(key):
+    name_key = '_'.join(key.split()).upper()
+    if name_key in FEAST_KEYS:
+        return name_key
+    match = _ISO_DATE.match(key)
+    if match:
+        try:
+            # the time is checked too, so 25:00 is no more a date than it
+            # is to dateutil
+            time(*(int(part or 0) for part in match.groups()[3:]))
+            return date(*map(int, match.groups()[:3]))
+        except ValueError:
+            pass
+    try:
+        parse(key)
+    except (ValueError, OverflowError):
+        # neither a feast name nor a date: a missing name
+        return name_key
+    return _FREE_FORM
+
+def _string_key(key):
+    '''
+    normalizes a string key to a feast name or a date; names and ISO-8601
+    dates are memoized in a bounded cache
+    '''
+    memo = _memo_key(key)
+    if memo is _FREE_FORM:
+        return parse(key).date()
+    return memo
 
 class LiturgicalDay(dict):
     '''
     represents days from the liturgical calendar with associated
     collects, psalms, and readings
+
+    keyed by feast name; a date index (several feasts per date, lowest
+    precedence first, so the observed one last) and a sorted ordinal
+    array, with the feasts on each ordinal in entries, are kept alongside;
+    collisions are resolved and displaced feasts transferred once, when
+    the year is built
+
+    the date index covers the days of the year only: the Sundays after
+    Christmas that a year's table puts in the next January are indexed,
+    and resolved against that January's feasts, by the next year's
+    calendar, which keeps them in carried
     '''
 
-    def __init__(self, year, switch=False):
+    def __init__(self, year):
         '''
         initializes the class
         '''
-        self.switch = switch
+        self.year = year
+        self.dates = {}
+        self.carried = ()
+        self._tables = None
         self._populate(year)
+        self._index()
+
+    @property
+    def tables(self):
+        '''
+        boundary tables for the year, built on first use
+        '''
+        if self._tables is None:
+            self._tables = YearTables(self)
+        return self._tables
+
+    def _index(self):
+        '''
+        builds the date index and the sorted ordinal array
+        '''
+        first = new_year_ordinal(self.year)
+        stop = new_year_ordinal(self.year + 1)
+        by_ordinal = {}
+        # carried feasts come first, so a feast of the year's own table
+        # takes precedence over one of the same tier
+        for position, feast in enumerate(chain(self.carried, dict.values(self))):
+            if first <= feast.ordinal < stop:
+                by_ordinal.setdefault(feast.ordinal, []).append((precedence(position, feast), feast))
+        self.ordinals = sorted(by_ordinal)
+        self.entries = [tuple(feast for rank, feast in sorted(by_ordinal[ordinal])) for ordinal in self.ordinals]
+        fromordinal = date.fromordinal
+        self.dates = {fromordinal(ordinal): feasts for ordinal, feasts in zip(self.ordinals, self.entries)}
 
     def __keytransform__(self, key):
-        if bool(self.switch):
-            if isinstance(key, str):
-                key = '_'.join(key.split()).upper()
-            else:
-                raise TypeError('Cannot handle non-string type {} in switched mode.'.format(str(type(key))))
+        kind = type(key)
+        if kind is str:
+            # canonical names skip normalization altogether
+            if dict.__contains__(self, key):
+                return key
+            return _string_key(key)
+        elif kind is date:
+            return key
+        elif kind is datetime:
+            return key.date()
+        elif kind is int or kind is float:
+            return datetime.utcfromtimestamp(key).date()
+        elif isinstance(key, str):
+            return _string_key(str(key))
+        elif isinstance(key, datetime):
+            key = key.date()
+        elif isinstance(key, date):
+            key = key
+        elif isinstance(key, int) or isinstance(key, float):
+            key = datetime.utcfromtimestamp(key).date()
         else:
-            if isinstance(key, datetime):
-                key = key.date()
-            elif isinstance(key, date):
-                key = key
-            elif isinstance(key, int) or isinstance(key, float):
-                key = datetime.utcfromtimestamp(key).date()
-            elif isinstance(key, str):
-                try:
-                    key = parse(key).date()
-                except (ValueError, OverflowError):
-                    raise ValueError('Cannot parse date from string {}'.format(str(key)))
-            else:
-                raise TypeError('Cannot convert type {} to date.'.format(str(type(key))))
+            raise TypeError('Cannot convert type {} to date.'.format(str(type(key))))
         return key
 
     def __contains__(self, key):
-        return dict.__contains__(self, self.__keytransform__(key))
+        key = self.__keytransform__(key)
+        if isinstance(key, str):
+            return dict.__contains__(self, key)
+        return key in self.dates
 
     def __getitem__(self, key):
-        return dict.__getitem__(self, self.__keytransform__(key))
+        key = self.__keytransform__(key)
+        if isinstance(key, str):
+            return dict.__getitem__(self, key)
+        # the last feast entered for a date takes precedence
+        return self.dates[key][-1]
 
     def get(self, key, default=None):
-        return dict.get(self, self.__keytransform__(key), default)
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def observance(self, today, evening=False):
+        '''
+        returns the feast name observed on a date, or the weekday name;
+        feasts marked evening only count after the evening cutoff
+        '''
+        feast = observed(self.dates.get(today, ()), evening)
+        if feast is not None:
+            return feast.name
+        return day_name[today.weekday()]
+
+    def between(self, start, end):
+        '''
+        returns the feasts of this calendar dated from start up to, but not
+        including, end, in date order
+        '''
+        low = bisect_left(self.ordinals, start.toordinal())
+        high = bisect_left(self.ordinals, end.toordinal())
+        return [feast for feasts in self.entries[low:high] for feast in feasts]
+
+    def commemorations(self, key):
+        '''
+        returns the feasts falling on a date that give way to the one
+        observed, greatest first
+        '''
+        return self.feasts_on(key)[-2::-1]
+
+    def feasts_on(self, key):
+        '''
+        returns every feast falling on a date, lowest precedence first
+        '''
+        key = self.__keytransform__(key)
+        if isinstance(key, str):
+            raise TypeError('Expected a date, got feast name {}.'.format(key))
+        return list(self.dates.get(key, ()))
 
     def pop(self, key, default=None):
-        if default is None:
-            return dict.pop(self, self.__keytransform__(key))
-        return dict.pop(self, self.__keytransform__(key), default)
+        try:
+            feast = self[key]
+        except KeyError:
+            if default is None:
+                raise
+            return default
+        for name_key, value in dict.items(self):
+            if value is feast:
+                dict.__delitem__(self, name_key)
+                break
+        self._index()
+        return feast
 
     def __eq__(self, other):
-        return dict.__eq__(self, other) and self.__dict__ == other.__dict__
+        return dict.__eq__(self, other) and self.year == getattr(other, 'year', None)
 
     def __ne__(self, other):
-        return dict.__ne__(self, other) or self.__dict__ != other.__dict__
-
-    def key_switcher(self, date_key, name_key):
-        switch_key = date_key
-        if bool(self.switch):
-            switch_key = name_key
-        return switch_key
+        return not self.__eq__(other)
 
     def _populate(self, year):
         '''
         populates with liturgical days
         '''
+        feasts = build_year(year)
+        carried = []
+        if year > MINYEAR:
+            first = new_year_ordinal(year)
+            carried = [feast for feast in build_year(year - 1) if feast.ordinal >= first]
+        feasts = transfer_feasts(carried + feasts)
+        self.carried = tuple(feasts[:len(carried)])
+        dict.update(self, [(feast.key, feast) for feast in feasts[len(carried):]])
+
+class Boundaries:
+    '''
+    sorted boundary table mapping a date ordinal to a label
+    '''
+
+    def __init__(self, intervals, first, last, default=None):
+        '''
+        flattens half-open (start, end, label) ordinal intervals over
+        first..last; where intervals overlap the earliest one wins, just
+        as in an if/elif chain, and None bounds are open-ended
+        '''
+        stop = last + 1
+        clipped = []
+        for start, end, label in intervals:
+            start = first if start is None else max(start, first)
+            end = stop if end is None else min(end, stop)
+            if start < end:
+                clipped.append((start, end, label))
+        cuts = sorted({first, stop}.union(*((start, end) for start, end, label in clipped)))
+        self.starts = []
+        self.labels = []
+        for cut in cuts[:-1]:
+            label = default
+            for start, end, candidate in clipped:
+                if start <= cut < end:
+                    label = candidate
+                    break
+            if not self.labels or self.labels[-1] != label:
+                self.starts.append(cut)
+                self.labels.append(label)
+
+    def __call__(self, ordinal):
+        return self.labels[bisect_right(self.starts, ordinal) - 1]
+
+    def cursor(self):
+        '''
+        returns a cursor for walking the table in date order
+        '''
+        return BoundaryCursor(self)
+
+class BoundaryCursor:
+    '''
+    steps through a Boundaries table for ascending ordinals without
+    searching from scratch each time
+    '''
+
+    def __init__(self, boundaries):
+        '''
+        initializes the class
+        '''
+        self.starts = boundaries.starts
+        self.labels = boundaries.labels
+        self.index = 0
+
+    def __call__(self, ordinal):
+        starts = self.starts
+        index = self.index
+        if ordinal < starts[index]:
+            index = bisect_right(starts, ordinal) - 1
+        while index + 1 < len(starts) and starts[index + 1] <= ordinal:
+            index += 1
+        self.index = index
+        return self.labels[index]
+
+class YearTables:
+    '''
+    per-year cycle, season and week boundaries for a calendar
+    '''
+
+    def __init__(self, calendar):
+        '''
+        initializes the class
+        '''
+        self.year = calendar.year
+        self.first = date(calendar.year, 1, 1).toordinal()
+        self.last = date(calendar.year, 12, 31).toordinal()
+
+        def day(name_key):
+            return dict.__getitem__(calendar, name_key).date.toordinal()
+
+        self.christmas_eve = day('CHRISTMAS_EVE')
+        self.eve_of_epiphany = day('EVE_OF_EPIPHANY')
+
+        proper = 8
+        for number in range(3, 8):
+            if dict.__getitem__(calendar, 'PROPER_' + str(number)).date > ABSENT:
+                proper = number
+                break
+        self.first_proper = proper
+
+        advent = day('FIRST_SUNDAY_OF_ADVENT')
+        if self.year % 2 == 0:
+            cycle = [(advent + 1, None, 'Daily Office Year One')]
+        else:
+            cycle = [(None, advent, 'Daily Office Year One')]
+        self.cycle = Boundaries(cycle, self.first, self.last, 'Daily Office Year Two')
+
+        self.season = Boundaries([
+            (advent, day('CHRISTMAS_DAY'), 'Advent Season'),
+            (day('CHRISTMAS_DAY'), None, 'Christmas Season'),
+            (None, day('THE_EPIPHANY'), 'Christmas Season'),
+            (day('THE_EPIPHANY'), day('ASH_WEDNESDAY'), 'Epiphany Season'),
+            (day('ASH_WEDNESDAY'), day('EASTER_DAY'), 'The Lenten Season'),
+            (day('EASTER_DAY'), day('TRINITY_SUNDAY') + 1, 'Easter'),
+        ], self.first, self.last, 'The Season after Pentecost')
+
+        sundays = [
+            ('FIRST_SUNDAY_OF_ADVENT', 'Week of 1 Advent'),
+            ('SECOND_SUNDAY_OF_ADVENT', 'Week of 2 Advent'),
+            ('THIRD_SUNDAY_OF_ADVENT', 'Week of 3 Advent'),
+            ('FOURTH_SUNDAY_OF_ADVENT', 'Week of 4 Advent'),
+            ('CHRISTMAS_DAY', None),
+        ]
+        week = self._weeks(day, sundays)
+        week += [
+            (day('CHRISTMAS_DAY'), None, 'Christmas Day and Following'),
+            (None, day('THE_EPIPHANY'), 'Christmas Day and Following'),
+        ]
+        sundays = [
+            ('THE_EPIPHANY', 'The Epiphany and Following'),
+            ('FIRST_SUNDAY_AFTER_EPIPHANY', 'Week of 1 Epiphany'),
+            ('SECOND_SUNDAY_AFTER_EPIPHANY', 'Week of 2 Epiphany'),
+            ('THIRD_SUNDAY_AFTER_EPIPHANY', 'Week of 3 Epiphany'),
+            ('FOURTH_SUNDAY_AFTER_EPIPHANY', 'Week of 4 Epiphany'),
+            ('FIFTH_SUNDAY_AFTER_EPIPHANY', 'Week of 5 Epiphany'),
+            ('SIXTH_SUNDAY_AFTER_EPIPHANY', 'Week of 6 Epiphany'),
+            ('SEVENTH_SUNDAY_AFTER_EPIPHANY', 'Week of 7 Epiphany'),
+            ('EIGHTH_SUNDAY_AFTER_EPIPHANY', 'Week of 8 Epiphany'),
+            ('LAST_SUNDAY_AFTER_EPIPHANY', 'Week of Last Epiphany'),
+            ('FIRST_SUNDAY_IN_LENT', 'Week of 1 Lent'),
+            ('SECOND_SUNDAY_IN_LENT', 'Week of 2 Lent'),
+            ('THIRD_SUNDAY_IN_LENT', 'Week of 3 Lent'),
+            ('FOURTH_SUNDAY_IN_LENT', 'Week of 4 Lent'),
+            ('FIFTH_SUNDAY_IN_LENT', 'Week of 5 Lent'),
+            ('PALM_SUNDAY', 'Holy Week'),
+            ('EASTER_DAY', 'Easter Week'),
+            ('SECOND_SUNDAY_OF_EASTER', 'Week of 2 Easter'),
+            ('THIRD_SUNDAY_OF_EASTER', 'Week of 3 Easter'),
+            ('FOURTH_SUNDAY_OF_EASTER', 'Week of 4 Easter'),
+            ('FIFTH_SUNDAY_OF_EASTER', 'Week of 5 Easter'),
+            ('SIXTH_SUNDAY_OF_EASTER', 'Week of 6 Easter'),
+            ('SEVENTH_SUNDAY_OF_EASTER', 'Week of 7 Easter'),
+            ('WHITSUNDAY', 'Week of Proper ' + str(proper - 2)),
+            ('TRINITY_SUNDAY', 'Week of Proper ' + str(proper - 1)),
+        ]
+        sundays += [('PROPER_' + str(number), 'Week of Proper ' + str(number)) for number in range(proper, 30)]
+        # the week of Proper 29 runs on until Advent
+        sundays.append((None, None))
+        week += self._weeks(day, sundays)
+        self.week = Boundaries(week, self.first, self.last)
+
+    def season_at(self, ordinal, evening=False, season=None):
+        '''
+        returns the season for a date ordinal; the evenings of Christmas
+        Eve and the Eve of Epiphany already belong to the next season
+        '''
+        if evening:
+            if ordinal == self.christmas_eve:
+                return 'Christmas Season'
+            elif ordinal == self.eve_of_epiphany:
+                return 'Epiphany Season'
+        if season is None:
+            season = self.season
+        return season(ordinal)
+
+    @staticmethod
+    def _weeks(day, sundays):
+        '''
+        pairs consecutive (name_key, label) Sundays into week intervals
+        '''
+        weeks = []
+        for (start, label), (end, _) in zip(sundays, sundays[1:]):
+            weeks.append((day(start), None if end is None else day(end), label))
+        return weeks
+
+# canonical hours, each observed nearest to its time of day
+HOURS = (
+    (time(6, 0), 'Daily Morning Prayer'),
+    (time(12, 0), 'An Order of Service for Noonday'),
+    (time(18, 0), 'Daily Evening Prayer'),
+    (time(21, 0), 'An Order for Compline'),
+)
+
+EVENING = time(15, 0)
+
+# wall-clock times just after which the canonical hour (the midpoints
+# between HOURS) or the evening cutoff change; the day changes at midnight
+TRANSITIONS = (time(9, 0), time(15, 0), time(19, 30))
+
+def _seconds(moment):
+    return moment.hour * 3600 + moment.minute * 60 + moment.second + moment.microsecond / 1000000
+
+def canonical_hour(moment):
+    '''
+    returns the canonical hour nearest a time of day; ties go to the
+    earlier hour
+    '''
+    seconds = _seconds(moment)
+    diffs = [abs(seconds - _seconds(start)) for start, name in HOURS]
+    return HOURS[diffs.index(min(diffs))][1]
+
+def _offset_change(low, high, tz):
+    '''
+    returns the first epoch second after low, up to high, at which the UTC
+    offset of tz differs from its offset at low
+    '''
+    def offset_at(second):
+        return datetime.fromtimestamp(second, timezone.utc).astimezone(tz).utcoffset()
+
+    offset = offset_at(low)
+    while high - low > 1:
+        middle = (low + high) // 2
+        if offset_at(middle) == offset:
+            low = middle
+        else:
+            high = middle
+    return datetime.fromtimestamp(high, timezone.utc)
+
+def transition_slot(moment):
+    '''
+    returns which of the spans between TRANSITIONS a time of day falls in;
+    the office cannot change within a slot of a day
+    '''
+    return bisect_left(TRANSITIONS, moment.time())
+
+def next_transition(now):
+    '''
+    returns the first moment after now at which the office may read
+    differently: just after the next canonical-hour midpoint or the
+    evening cutoff, local midnight, or a change of UTC offset, whichever
+    comes first; aware when now is aware
+    '''
+    wall = now.replace(tzinfo=None)
+    slot = transition_slot(wall)
+    if slot < len(TRANSITIONS):
+        candidate = datetime.combine(wall.date(), TRANSITIONS[slot]) + timedelta(microseconds=1)
+    else:
+        candidate = datetime.combine(wall.date() + timedelta(days=1), time(0, 0))
+    offset = now.utcoffset()
+    if offset is None:
+        return candidate
+    instant = (candidate - offset).replace(tzinfo=timezone.utc)
+    if instant.astimezone(now.tzinfo).utcoffset() != offset:
+        # the wall clock jumps first
+        instant = _offset_change(int(now.timestamp()), int(instant.timestamp()), now.tzinfo)
+    return instant.astimezone(now.tzinfo)
+
+def previous_transition(now):
+    '''
+    returns the moment from which the office has read as it does at now:
+    just after the last canonical-hour midpoint or the evening cutoff,
+    local midnight, or a change of UTC offset, whichever came last
+    '''
+    wall = now.replace(tzinfo=None)
+    slot = transition_slot(wall)
+    if slot:
+        candidate = datetime.combine(wall.date(), TRANSITIONS[slot - 1]) + timedelta(microseconds=1)
+    else:
+        candidate = datetime.combine(wall.date(), time(0, 0))
+    offset = now.utcoffset()
+    if offset is None:
+        return candidate
+    instant = (candidate - offset).replace(tzinfo=timezone.utc)
+    if instant.astimezone(now.tzinfo).utcoffset() != offset:
+        # the wall clock jumped since
+        instant = _offset_change(int(instant.timestamp()), int(now.timestamp()), now.tzinfo)
+    return instant.astimezone(now.tzinfo)
+
+Office = namedtuple('Office', 'now cycle season week day hour')
+
+class CalendarCache:
+    '''
+    bounded, thread-safe LRU cache of built calendars keyed by year
+    '''
+
+    def __init__(self, maxsize=16):
+        '''
+        initializes the class
+        '''
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._calendars = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, year):
+        '''
+        returns the calendar for a year, building it on a miss
+        '''
+        with self._lock:
+            calendar = self._calendars.get(year)
+            if calendar is not None:
+                self._calendars.move_to_end(year)
+                self.hits += 1
+                return calendar
+            self.misses += 1
+        # build outside the lock so a slow build never blocks other years
+        calendar = LiturgicalDay(year=year)
+        with self._lock:
+            calendar = self._calendars.setdefault(year, calendar)
+            self._calendars.move_to_end(year)
+            while len(self._calendars) > self.maxsize:
+                self._calendars.popitem(last=False)
+        return calendar
+
+    def invalidate(self, year=None):
+        '''
+        drops one year (or every year) from the cache
+        '''
+        with self._lock:
+            if year is None:
+                self._calendars.clear()
+            else:
+                self._calendars.pop(year, None)
+
+    def info(self):
+        '''
+        returns hit/miss counters and current size
+        '''
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._calendars),
+                'maxsize': self.maxsize,
+            }
+
+calendar_cache = CalendarCache()
+
+class CalendarWindow:
+    '''
+    the calendars of three consecutive years, fetched as they are first
+    needed, answering queries for any date among them
+    '''
+
+    FIELDS = ('cycle', 'season', 'week')
+
+    def __init__(self, year, cache=calendar_cache, calendars=None):
+        '''
+        initializes the class for the years before, of and after year;
+        cache supplies calendars through get(year), None to build them
+        '''
+        self.year = year
+        self.years = range(year - 1, year + 2)
+        self.cache = cache
+        self.first = date(year - 1, 1, 1).toordinal()
+        self.last = date(year + 1, 12, 31).toordinal()
+        self._calendars = dict(calendars or {})
+
+    def __contains__(self, key):
+        return self.first <= self._ordinal(key) <= self.last
+
+    @staticmethod
+    def _ordinal(key):
+        if isinstance(key, int):
+            return key
+        return key.toordinal()
+
+    def get(self, year):
+        '''
+        returns the calendar for a year of the window, so that the window
+        can stand in for the calendar cache
+        '''
+        if year not in self.years:
+            raise ValueError('{} is outside the window of {} to {}.'.format(year, self.years[0], self.years[-1]))
+        calendar = self._calendars.get(year)
+        if calendar is None:
+            if self.cache is None:
+                calendar = LiturgicalDay(year=year)
+            else:
+                calendar = self.cache.get(year)
+            self._calendars[year] = calendar
+        return calendar
+
+    def calendar(self, key):
+        '''
+        returns the calendar of the year a date or ordinal falls in
+        '''
+        if isinstance(key, int):
+            key = date.fromordinal(key)
+        return self.get(key.year)
+
+    def tables(self, key):
+        '''
+        returns the boundary tables of the year a date or ordinal falls in
+        '''
+        return self.calendar(key).tables
+
+    def slide(self, year):
+        '''
+        returns the window centred on year, keeping the calendars the two
+        windows share
+        '''
+        kept = {y: calendar for y, calendar in self._calendars.items() if year - 1 <= y <= year + 1}
+        return CalendarWindow(year, self.cache, kept)
+
+    def cycle(self, key):
+        return self.tables(key).cycle(self._ordinal(key))
+
+    def season(self, key, evening=False):
+        return self.tables(key).season_at(self._ordinal(key), evening)
+
+    def week(self, key):
+        return self.tables(key).week(self._ordinal(key))
+
+    def observance(self, key, evening=False):
+        if isinstance(key, int):
+            key = date.fromordinal(key)
+        return self.calendar(key).observance(key, evening)
+
+    def _run(self, field, ordinal):
+        '''
+        returns the first and last ordinals of the run of ordinal within
+        its own year
+        '''
+        tables = self.tables(ordinal)
+        boundaries = getattr(tables, field)
+        index = bisect_right(boundaries.starts, ordinal) - 1
+        if index + 1 < len(boundaries.starts):
+            return boundaries.starts[index], boundaries.starts[index + 1] - 1
+        return boundaries.starts[index], tables.last
+
+    def span(self, field, key):
+        '''
+        returns the first and last dates of the run of days around key
+        that share its cycle, season or week, followed into the
+        neighbouring years of the window but not beyond them
+        '''
+        if field not in self.FIELDS:
+            raise ValueError('{} is not one of {}.'.format(field, ', '.join(self.FIELDS)))
+        ordinal = self._ordinal(key)
+        label = getattr(self, field)(ordinal)
+        first, last = self._run(field, ordinal)
+        while first - 1 >= self.first and getattr(self, field)(first - 1) == label:
+            first = self._run(field, first - 1)[0]
+        while last + 1 <= self.last and getattr(self, field)(last + 1) == label:
+            last = self._run(field, last + 1)[1]
+        return date.fromordinal(first), date.fromordinal(last)
+
+    def advent(self, year):
+        '''
+        returns the first Sunday of Advent of a year of the window
+        '''
+        return dict.__getitem__(self.get(year), 'FIRST_SUNDAY_OF_ADVENT').date
+
+    def liturgical_year(self, key):
+        '''
+        returns the civil year in which the liturgical year holding key
+        ends; each begins on the first Sunday of Advent before it
+        '''
+        if isinstance(key, int):
+            key = date.fromordinal(key)
+        if isinstance(key, datetime):
+            key = key.date()
+        if key >= self.advent(key.year):
+            return key.year + 1
+        return key.year
+
+class Observances:
+    '''
+    date-ordered feed of feasts across years, drawn from the sorted
+    per-year indexes of the calendars
+    '''
+
+    # a feast that has not fallen in this many years is taken never to
+    SEARCH_YEARS = 400
+
+    def __init__(self, cache=calendar_cache):
+        '''
+        initializes the class; cache supplies calendars through get(year),
+        None to build them
+        '''
+        self.cache = cache
+
+    def _calendar(self, year):
+        if self.cache is None:
+            return LiturgicalDay(year=year)
+        return self.cache.get(year)
+
+    def between(self, start, end=None, tiers=None):
+        '''
+        yields the feasts dated from start up to, but not including, end,
+        or on for good without it, in date order and lowest precedence
+        first on each date; tiers limits the feed to those tiers
+
+        the years are merged on a heap, each opened only once the feed
+        reaches it
+        '''
+        first = start.toordinal()
+        stop = None if end is None else end.toordinal()
+        heap = []
+
+        def open_year(year):
+            calendar = self._calendar(year)
+            index = bisect_left(calendar.ordinals, first)
+            if index < len(calendar.ordinals):
+                heapq.heappush(heap, (calendar.ordinals[index], year, index, calendar))
+
+        year = start.year
+        open_year(year)
+        while True:
+            # no calendar holds dates before its own year
+            following = new_year_ordinal(year + 1)
+            if ((not heap or heap[0][0] >= following) and year + 1 < MAXYEAR
+                    and (stop is None or following < stop)):
+                year += 1
+                open_year(year)
+                continue
+            if not heap:
+                return
+            ordinal, calendar_year, index, calendar = heapq.heappop(heap)
+            if stop is not None and ordinal >= stop:
+                return
+            for feast in calendar.entries[index]:
+                if tiers is None or feast.tier in tiers:
+                    yield feast
+            index += 1
+            if index < len(calendar.ordinals):
+                heapq.heappush(heap, (calendar.ordinals[index], calendar_year, index, calendar))
+
+    def upcoming(self, now, count, tiers=None, evening=True):
+        '''
+        returns the next count feasts dated after the day of now; pass
+        evening=False to leave out those kept only in the evening
+        '''
+        if isinstance(now, datetime):
+            now = now.date()
+        feed = self.between(now + timedelta(days=1), tiers=tiers)
+        if not evening:
+            feed = (feast for feast in feed if not feast.evening)
+        return list(islice(feed, count))
+
+    def _occurrences(self, key, years):
+        # names are taken in any form a calendar accepts
+        name_key = _string_key(key) if isinstance(key, str) else key
+        if name_key not in FEAST_KEYS:
+            raise KeyError(key)
+        for year in years:
+            if MINYEAR <= year < MAXYEAR:
+                feast = dict.__getitem__(self._calendar(year), name_key)
+                if feast.ordinal:
+                    yield feast
+
+    def next_occurrence(self, key, after):
+        '''
+        returns the first feast with the name key dated after a date, or
+        None
+        '''
+        ordinal = after.toordinal()
+        # the calendar of the year before may hold it early in this one
+        years = range(after.year - 1, after.year + self.SEARCH_YEARS)
+        for feast in self._occurrences(key, years):
+            if feast.ordinal > ordinal:
+                return feast
+        return None
+
+    def previous_occurrence(self, key, before):
+        '''
+        returns the last feast with the name key dated before a date, or
+        None
+        '''
+        ordinal = before.toordinal()
+        years = range(before.year, before.year - self.SEARCH_YEARS, -1)
+        for feast in self._occurrences(key, years):
+            if feast.ordinal < ordinal:
+                return feast
+        return None
+
+observances = Observances()
+
+class LazyField:
+    '''
+    an attribute computed by a method on first access and then kept on
+    the instance
+    '''
 
-        #============================Tier 6============================
-
-        # Eve of the Baptism of our Lord
-        date_key = date(year, 1, 6) + rd(days=1, weekday=SU(+1)) - rd(days=1)
-        if date_key >= (easter(year) - rd(days=46, weekday=SU(-1))):
-            date_key = date(1970, 1, 1)
-        name_key = 'EVE_OF_1_EPIPHANY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eve of the Baptism of our Lord',
-            'date': date_key,
-        }
-
-        #============================Tier 5============================
-
-        # The Confession of Saint Peter the Apostle
-        date_key = date(year, 1, 18)
-        name_key = 'CONFESSION_OF_ST_PETER'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Confession of Saint Peter the Apostle',
-            'date': date_key,
-        }
-
-        # The Conversion of Saint Paul the Apostle
-        date_key = date(year, 1, 25)
-        name_key = 'CONVERSION_OF_ST_PAUL'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Conversion of Saint Paul the Apostle',
-            'date': date_key,
-        }
-
-        # Saint Matthias the Apostle
-        date_key = date(year, 2, 24)
-        name_key = 'ST_MATTHIAS'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Matthias the Apostle',
-            'date': date_key,
-        }
-
-        # Saint Joseph
-        date_key = date(year, 3, 19)
-        name_key = 'ST_JOSEPH'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Joseph',
-            'date': date_key,
-        }
-
-        # Eve of the Annunciation
-        date_key = date(year, 3, 24)
-        name_key = 'EVE_OF_THE_ANNUNCIATION'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eve of the Annunciation',
-            'date': date_key,
-            'evening': True,
-        }
-
-        # The Annunciation of Our Lord Jesus Christ to the Blessed Virgin Mary
-        date_key = date(year, 3, 25)
-        name_key = 'THE_ANNUNCIATION'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Annunciation of Our Lord Jesus Christ to the Blessed Virgin Mary',
-            'date': date_key,
-        }
-
-        # Saint Mark the Evangelist
-        date_key = date(year, 4, 25)
-        name_key = 'SS_PHILLIP_JAMES'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Mark the Evangelist',
-            'date': date_key,
-        }
-
-        # Saint Philip and Saint James, Apostles
-        date_key = date(year, 5, 1)
-        name_key = 'SS_PHILIP_JAMES'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Philip and Saint James, Apostles',
-            'date': date_key,
-        }
-
-        # Eve of the Visitation
-        date_key = date(year, 5, 30)
-        name_key = 'EVE_OF_THE_VISITATION'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eve of the Visitation',
-            'date': date_key,
-            'evening': True,
-        }
-
-        # The Visitation of the Blessed Virgin Mary
-        date_key = date(year, 5, 31)
-        name_key = 'THE_VISITATION'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Visitation of the Blessed Virgin Mary',
-            'date': date_key,
-        }
-
-        # Saint Barnabas the Apostle
-        date_key = date(year, 6, 11)
-        name_key = 'ST_BARNABAS'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Barnabas the Apostle',
-            'date': date_key,
-        }
-
-        # Eve of Saint John the Baptist
-        date_key = date(year, 6, 23)
-        name_key = 'EVE_OF_ST_JOHN_THE_BAPTIST'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eve of Saint John the Baptist',
-            'date': date_key,
-            'evening': True,
-        }
-
-        # The Nativity of Saint John the Baptist
-        date_key = date(year, 6, 24)
-        name_key = 'ST_JOHN_THE_BAPTIST'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Nativity of Saint John the Baptist',
-            'date': date_key,
-        }
-
-        # Saint Peter and Saint Paul, Apostles
-        date_key = date(year, 6, 29)
-        name_key = 'SS_PETER_PAUL'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Peter and Saint Paul, Apostles',
-            'date': date_key,
-        }
-
-        # Independence Day
-        date_key = date(year, 7, 4)
-        name_key = 'INDEPENDENCE_DAY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Independence Day',
-            'date': date_key,
-        }
-
-        # Saint Mary Magdalene
-        date_key = date(year, 7, 22)
-        name_key = 'ST_MARY_MAGDALENE'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Mary Magdalene',
-            'date': date_key,
-        }
-
-        # Saint James the Apostle
-        date_key = date(year, 7, 25)
-        name_key = 'ST_JAMES'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint James the Apostle',
-            'date': date_key,
-        }
-
-        # Saint Mary the Virgin, Mother of Our Lord Jesus Christ
-        date_key = date(year, 8, 15)
-        name_key = 'ST_MARY_THE_VIRGIN'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Mary the Virgin, Mother of Our Lord Jesus Christ',
-            'date': date_key,
-        }
-
-        # Saint Bartholomew the Apostle
-        date_key = date(year, 8, 24)
-        name_key = 'ST_BARTHOLOMEW'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Bartholomew the Apostle',
-            'date': date_key,
-        }
-
-        # Eve of Holy Cross
-        date_key = date(year, 9, 13)
-        name_key = 'EVE_OF_HOLY_CROSS'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eve of Holy Cross',
-            'date': date_key,
-            'evening': True,
-        }
-
-        # Holy Cross Day
-        date_key = date(year, 9, 14)
-        name_key = 'HOLY_CROSS_DAY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Holy Cross Day',
-            'date': date_key,
-        }
-
-        # Saint Matthew, Apostle and Evangelist
-        date_key = date(year, 9, 21)
-        name_key = 'ST_MATTHEW'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Matthew, Apostle and Evangelist',
-            'date': date_key,
-        }
-
-        # Saint Michael and All Angels
-        date_key = date(year, 9, 29)
-        name_key = 'ST_MICHAEL_ALL_ANGELS'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Michael and All Angels',
-            'date': date_key,
-        }
-
-        # Saint Luke the Evangelist
-        date_key = date(year, 10, 18)
-        name_key = 'ST_LUKE'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Luke the Evangelist',
-            'date': date_key,
-        }
-
-        # Saint James of Jerusalem, Brother of Our Lord Jesus Christ, and Martyr
-        date_key = date(year, 10, 23)
-        name_key = 'ST_JAMES_OF_JERUSALEM'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint James of Jerusalem, Brother of Our Lord Jesus Christ, and Martyr',
-            'date': date_key,
-        }
-
-        # Saint Simon and Saint Jude, Apostles
-        date_key = date(year, 10, 28)
-        name_key = 'SS_SIMON_JUDE'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Simon and Saint Jude, Apostles',
-            'date': date_key,
-        }
-
-        # Thanksgiving Day
-        date_key = date(year, 11, 1) + rd(weekday=TH(+4))
-        name_key = 'THANKSGIVING_DAY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Thanksgiving Day',
-            'date': date_key,
-        }
-
-        # Saint Andrew the Apostle
-        date_key = date(year, 11, 30)
-        name_key = 'ST_ANDREW'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Andrew the Apostle',
-            'date': date_key,
-        }
-
-        # Saint Thomas the Apostle
-        date_key = date(year, 12, 21)
-        name_key = 'ST_THOMAS'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Thomas the Apostle',
-            'date': date_key,
-        }
-
-        # Saint Stephen, Deacon and Martyr
-        date_key = date(year, 12, 26)
-        name_key = 'ST_STEPHEN'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint Stephen, Deacon and Martyr',
-            'date': date_key,
-        }
-
-        # Saint John, Apostle and Evangelist
-        date_key = date(year, 12, 27)
-        name_key = 'ST_JOHN'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Saint John, Apostle and Evangelist',
-            'date': date_key,
-        }
-
-        # The Holy Innocents
-        date_key = date(year, 12, 28)
-        name_key = 'HOLY_INNOCENTS'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Holy Innocents',
-            'date': date_key,
-        }
-
-        #============================Tier 4============================
-
-        # Ash Wednesday
-        date_key = easter(year) - rd(days=46)
-        name_key = 'ASH_WEDNESDAY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Ash Wednesday',
-            'date': date_key,
-        }
-
-        #============================Tier 3============================
-
-        # First Sunday of Advent
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-4))
-        name_key = 'FIRST_SUNDAY_OF_ADVENT'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'First Sunday of Advent',
-            'date': date_key,
-        }
-
-        # Second Sunday of Advent
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-3))
-        name_key = 'SECOND_SUNDAY_OF_ADVENT'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Second Sunday of Advent',
-            'date': date_key,
-        }
-
-        # Third Sunday of Advent
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-2))
-        name_key = 'THIRD_SUNDAY_OF_ADVENT'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Third Sunday of Advent',
-            'date': date_key,
-        }
-
-        # Fourth Sunday of Advent
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-1))
-        name_key = 'FOURTH_SUNDAY_OF_ADVENT'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Fourth Sunday of Advent',
-            'date': date_key,
-        }
-
-        # First Sunday after Christmas Day
-        date_key = date(year, 12, 25) + rd(days=1, weekday=SU(+1))
-        name_key = 'FIRST_SUNDAY_AFTER_CHRISTMAS'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'First Sunday after Christmas Day',
-            'date': date_key,
-        }
-
-        # Second Sunday after Christmas Day
-        date_key = date(year, 12, 25) + rd(days=1, weekday=SU(+2))
-        name_key = 'SECOND_SUNDAY_AFTER_CHRISTMAS'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Second Sunday after Christmas Day',
-            'date': date_key,
-        }
-
-        # First Sunday after the Epiphany: The Baptism of our Lord
-        date_key = date(year, 1, 6) + rd(days=1, weekday=SU(+1))
-        if date_key >= (easter(year) - rd(days=46, weekday=SU(-1))):
-            date_key = date(1970, 1, 1)
-        name_key = 'FIRST_SUNDAY_AFTER_EPIPHANY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'First Sunday after the Epiphany: The Baptism of our Lord',
-            'date': date_key,
-        }
-
-        # Second Sunday after the Epiphany
-        date_key = date(year, 1, 6) + rd(days=1, weekday=SU(+2))
-        if date_key >= (easter(year) - rd(days=46, weekday=SU(-1))):
-            date_key = date(1970, 1, 1)
-        name_key = 'SECOND_SUNDAY_AFTER_EPIPHANY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Second Sunday after the Epiphany',
-            'date': date_key,
-        }
-
-        # Third Sunday after the Epiphany
-        date_key = date(year, 1, 6) + rd(days=1, weekday=SU(+3))
-        if date_key >= (easter(year) - rd(days=46, weekday=SU(-1))):
-            date_key = date(1970, 1, 1)
-        name_key = 'THIRD_SUNDAY_AFTER_EPIPHANY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Third Sunday after the Epiphany',
-            'date': date_key,
-        }
-
-        # Fourth Sunday after the Epiphany
-        date_key = date(year, 1, 6) + rd(days=1, weekday=SU(+4))
-        if date_key >= (easter(year) - rd(days=46, weekday=SU(-1))):
-            date_key = date(1970, 1, 1)
-        name_key = 'FOURTH_SUNDAY_AFTER_EPIPHANY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Fourth Sunday after the Epiphany',
-            'date': date_key,
-        }
-
-        # Fifth Sunday after the Epiphany
-        date_key = date(year, 1, 6) + rd(days=1, weekday=SU(+5))
-        if date_key >= (easter(year) - rd(days=46, weekday=SU(-1))):
-            date_key = date(1970, 1, 1)
-        name_key = 'FIFTH_SUNDAY_AFTER_EPIPHANY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Fifth Sunday after the Epiphany',
-            'date': date_key,
-        }
-
-        # Sixth Sunday after the Epiphany
-        date_key = date(year, 1, 6) + rd(days=1, weekday=SU(+6))
-        if date_key >= (easter(year) - rd(days=46, weekday=SU(-1))):
-            date_key = date(1970, 1, 1)
-        name_key = 'SIXTH_SUNDAY_AFTER_EPIPHANY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sixth day after the Epiphany',
-            'date': date_key,
-        }
-
-        # Seventh Sunday after the Epiphany
-        date_key = date(year, 1, 6) + rd(days=1, weekday=SU(+7))
-        if date_key >= (easter(year) - rd(days=46, weekday=SU(-1))):
-            date_key = date(1970, 1, 1)
-        name_key = 'SEVENTH_SUNDAY_AFTER_EPIPHANY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Seventh Sunday after the Epiphany',
-            'date': date_key,
-        }
-
-        # Eighth Sunday after the Epiphany
-        date_key = date(year, 1, 6) + rd(days=1, weekday=SU(+8))
-        if date_key >= (easter(year) - rd(days=46, weekday=SU(-1))):
-            date_key = date(1970, 1, 1)
-        name_key = 'EIGHTH_SUNDAY_AFTER_EPIPHANY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eighth Sunday after the Epiphany',
-            'date': date_key,
-        }
-
-        # Last Sunday after the Epiphany
-        date_key = (easter(year) - rd(days=46, weekday=SU(-1)))
-        name_key = 'LAST_SUNDAY_AFTER_EPIPHANY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Last Sunday after the Epiphany',
-            'date': date_key,
-        }
-
-        # First Sunday in Lent
-        date_key = (easter(year) - rd(days=46) + rd(days=1, weekday=SU(+1)))
-        name_key = 'FIRST_SUNDAY_IN_LENT'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'First Sunday in Lent',
-            'date': date_key,
-        }
-
-        # Second Sunday in Lent
-        date_key = (easter(year) - rd(days=46) + rd(days=1, weekday=SU(+2)))
-        name_key = 'SECOND_SUNDAY_IN_LENT'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Second Sunday in Lent',
-            'date': date_key,
-        }
-
-        # Third Sunday in Lent
-        date_key = (easter(year) - rd(days=46) + rd(days=1, weekday=SU(+3)))
-        name_key = 'THIRD_SUNDAY_IN_LENT'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Third Sunday in Lent',
-            'date': date_key,
-        }
-
-        # Fourth Sunday in Lent
-        date_key = (easter(year) - rd(days=46) + rd(days=1, weekday=SU(+4)))
-        name_key = 'FOURTH_SUNDAY_IN_LENT'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Fourth Sunday in Lent',
-            'date': date_key,
-        }
-
-        # Fifth Sunday in Lent
-        date_key = (easter(year) - rd(days=46) + rd(days=1, weekday=SU(+5)))
-        name_key = 'FIFTH_SUNDAY_IN_LENT'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Fifth Sunday in Lent',
-            'date': date_key,
-        }
-
-        # The Sunday of the Passion: Palm Sunday
-        date_key = easter(year) - rd(days=7)
-        name_key = 'PALM_SUNDAY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Sunday of the Passion: Palm Sunday',
-            'date': date_key,
-        }
-
-        # Second Sunday of Easter
-        date_key = easter(year) + rd(days=1, weekday=SU(+1))
-        name_key = 'SECOND_SUNDAY_OF_EASTER'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Second Sunday of Easter',
-            'date': date_key,
-        }
-
-        # Third Sunday of Easter
-        date_key = easter(year) + rd(days=1, weekday=SU(+2))
-        name_key = 'THIRD_SUNDAY_OF_EASTER'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Third Sunday of Easter',
-            'date': date_key,
-        }
-
-        # Fourth Sunday of Easter
-        date_key = easter(year) + rd(days=1, weekday=SU(+3))
-        name_key = 'FOURTH_SUNDAY_OF_EASTER'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Fourth Sunday of Easter',
-            'date': date_key,
-        }
-
-        # Fifth Sunday of Easter
-        date_key = easter(year) + rd(days=1, weekday=SU(+4))
-        name_key = 'FIFTH_SUNDAY_OF_EASTER'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Fifth Sunday of Easter',
-            'date': date_key,
-        }
-
-        # Sixth Sunday of Easter
-        date_key = easter(year) + rd(days=1, weekday=SU(+5))
-        name_key = 'SIXTH_SUNDAY_OF_EASTER'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sixth Sunday of Easter',
-            'date': date_key,
-        }
-
-        # Seventh Sunday of Easter
-        date_key = easter(year) + rd(days=1, weekday=SU(+6))
-        name_key = 'SEVENTH_SUNDAY_OF_EASTER'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Seventh Sunday of Easter',
-            'date': date_key,
-        }
-
-        # Proper 3
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-31))
-        if date_key <= (easter(year) + rd(days=56)):
-            date_key = date(1970, 1, 1)
-        name_key = 'PROPER_3'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 4
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-30))
-        if date_key <= (easter(year) + rd(days=56)):
-            date_key = date(1970, 1, 1)
-        name_key = 'PROPER_4'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 5
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-29))
-        if date_key <= (easter(year) + rd(days=56)):
-            date_key = date(1970, 1, 1)
-        name_key = 'PROPER_5'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 6
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-28))
-        if date_key <= (easter(year) + rd(days=56)):
-            date_key = date(1970, 1, 1)
-        name_key = 'PROPER_6'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 7
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-27))
-        if date_key <= (easter(year) + rd(days=56)):
-            date_key = date(1970, 1, 1)
-        name_key = 'PROPER_7'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 8
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-26))
-        if date_key <= (easter(year) + rd(days=56)):
-            date_key = date(1970, 1, 1)
-        name_key = 'PROPER_8'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 9
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-25))
-        name_key = 'PROPER_9'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 10
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-24))
-        name_key = 'PROPER_10'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 11
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-23))
-        name_key = 'PROPER_11'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 12
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-22))
-        name_key = 'PROPER_12'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 13
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-21))
-        name_key = 'PROPER_13'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 14
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-20))
-        name_key = 'PROPER_14'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 15
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-19))
-        name_key = 'PROPER_15'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 16
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-18))
-        name_key = 'PROPER_16'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 17
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-17))
-        name_key = 'PROPER_17'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper =18
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-16))
-        name_key = 'PROPER_18'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 19
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-15))
-        name_key = 'PROPER_19'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 20
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-14))
-        name_key = 'PROPER_20'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 21
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-13))
-        name_key = 'PROPER_21'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 22
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-12))
-        name_key = 'PROPER_22'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 23
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-11))
-        name_key = 'PROPER_23'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 24
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-10))
-        name_key = 'PROPER_24'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 25
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-9))
-        name_key = 'PROPER_25'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 26
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-8))
-        name_key = 'PROPER_26'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 27
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-7))
-        name_key = 'PROPER_27'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 28
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-6))
-        name_key = 'PROPER_28'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        # Proper 29
-        date_key = date(year, 12, 25) - rd(days=1, weekday=SU(-5))
-        name_key = 'PROPER_29'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Sunday',
-            'date': date_key,
-        }
-
-        #============================Tier 2============================
-
-        # The Holy Name of Our Lord Jesus Christ
-        date_key = date(year, 1, 1)
-        name_key = 'THE_HOLY_NAME'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Holy Name of Our Lord Jesus Christ',
-            'date': date_key,
-        }
-
-        # Eve of the Presentation
-        date_key = date(year, 2, 1)
-        name_key = 'EVE_OF_THE_PRESENTATION'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eve of the Presentation',
-            'date': date_key,
-            'evening': True,
-        }
-
-        # The Presentation of Our Lord Jesus Christ in the Temple
-        date_key = date(year, 2, 2)
-        name_key = 'THE_PRESENTATION'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Presentation of Our Lord Jesus Christ in the Temple',
-            'date': date_key,
-        }
-
-        # Eve of the Transfiguration
-        date_key = date(year, 8, 5)
-        name_key = 'EVE_OF_THE_TRANSFIGURATION'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eve of the Transfiguration',
-            'date': date_key,
-            'evening': True,
-        }
-
-        # The Transfiguration of Our Lord Jesus Christ
-        date_key = date(year, 8, 6)
-        name_key = 'THE_TRANSFIGURATION'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Transfiguration of Our Lord Jesus Christ',
-            'date': date_key,
-        }
-
-        #============================Tier 1============================
-
-        # Eve of Epiphany
-        date_key = date(year, 1, 5)
-        name_key = 'EVE_OF_EPIPHANY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eve of Epiphany',
-            'date': date_key,
-            'evening': True,
-        }
-
-        # The Epiphany of Our Lord Jesus Christ
-        date_key = date(year, 1, 6)
-        name_key = 'THE_EPIPHANY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Epiphany of Our Lord Jesus Christ',
-            'date': date_key,
-        }
-
-        # The Sunday of the Resurrection, or Easter Day
-        date_key = easter(year)
-        name_key = 'EASTER_DAY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Sunday of the Resurrection, or Easter Day',
-            'date': date_key,
-        }
-
-        # Eve of Ascension Day
-        date_key = easter(year) + rd(days=38)
-        name_key = 'EVE_OF_ASCENSION_DAY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eve of Ascension Day',
-            'date': date_key,
-            'evening': True,
-        }
-
-        # Ascension Day
-        date_key = easter(year) + rd(days=39)
-        name_key = 'ASCENSION_DAY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Ascension Day',
-            'date': date_key,
-        }
-
-        # Eve of Pentecost
-        date_key = easter(year) + rd(days=48)
-        name_key = 'EVE_OF_PENTECOST'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eve of Pentecost',
-            'date': date_key,
-            'evening': True,
-        }
-
-        # The Day of Pentecost: Whitsunday
-        date_key = easter(year) + rd(days=49)
-        name_key = 'WHITSUNDAY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Day of Pentecost: Whitsunday',
-            'date': date_key,
-        }
-
-        # The First Sunday after Pentecost: Trinity Sunday
-        date_key = easter(year) + rd(days=56)
-        name_key = 'TRINITY_SUNDAY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The First Sunday after Pentecost: Trinity Sunday',
-            'date': date_key,
-        }
-
-        # Eve of All Saints
-        date_key = date(year, 10, 31)
-        name_key = 'EVE_OF_ALL_SAINTS'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eve of All Saints',
-            'date': date_key,
-            'evening': True,
-        }
-
-        # All Saint's Day
-        date_key = date(year, 11, 1)
-        name_key = 'ALL_SAINTS_DAY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'All Saints Day',
-            'date': date_key,
-        }
-
-        # Christmas Eve
-        date_key = date(year, 12, 24)
-        name_key = 'CHRISTMAS_EVE'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Christmas Eve',
-            'date': date_key,
-            'evening': True,
-        }
-
-        # The Nativity of Our Lord Jesus Christ
-        date_key = date(year, 12, 25)
-        name_key = 'CHRISTMAS_DAY'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'The Nativity of Our Lord Jesus Christ',
-            'date': date_key,
-        }
-
-        # Eve of Holy Name
-        date_key = date(year, 12, 31)
-        name_key = 'EVE_OF_THE_HOLY_NAME'
-        switch_key = self.key_switcher(date_key, name_key)
-        self[switch_key] = {
-            'name': 'Eve of Holy Name',
-            'date': date_key,
-            'evening': True,
-        }
+    def __init__(self, method):
+        '''
+        initializes the class
+        '''
+        self.method = method
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = getattr(instance, self.method)()
+        # shadows this descriptor from now on
+        instance.__dict__[self.name] = value
+        return value
 
 class DailyOffice:
     '''
     superclass for the individual offices
     '''
 
-    def __init__(self, now=datetime.now()):
+    # a prebuilt doc.office_table.OfficeTable answers any date it covers
+    # without building a calendar
+    table = None
+
+    row = LazyField('get_row')
+    lday = LazyField('get_lday')
+    cycle = LazyField('get_cycle')
+    season = LazyField('get_season')
+    week = LazyField('get_week')
+    day = LazyField('get_day')
+    hour = LazyField('get_hour')
+
+    def __init__(self, now=datetime.now(), cache=calendar_cache, table=None, calendar=None):
         '''
-        initializes the class
+        initializes the class; the fields are worked out when first read
+
+        cache is whatever supplies the calendar for a year through
+        get(year), None to build a private one; calendar is a prebuilt
+        LiturgicalDay for the year of now, shared between offices; pass
+        table=False to ignore the class-wide office table, which is also
+        ignored when a calendar or another cache is given, as it only
+        holds the offices of the default calendars
         '''
         self.now = now
-        self.ldate = LiturgicalDay(year=now.year, switch=False)
-        self.lday = LiturgicalDay(year=now.year, switch=True)
-        self.cycle = self.get_cycle()
-        self.season = self.get_season()
-        self.week = self.get_week()
-        self.day = self.get_day()
-        self.hour = self.get_hour()
+        self.cache = cache
+        if table is not None:
+            self.table = table
+        elif calendar is not None or cache is not calendar_cache:
+            self.table = None
+        if calendar is not None:
+            if calendar.year != now.year:
+                raise ValueError('The calendar is for {}, not {}.'.format(calendar.year, now.year))
+            self.lday = calendar
+
+    def get_row(self):
+        '''
+        returns the office table row for now, or None
+        '''
+        if self.table:
+            return self.table.lookup(self.now)
+        return None
+
+    def get_lday(self):
+        '''
+        returns the calendar for the current year
+        '''
+        if self.cache is None:
+            return LiturgicalDay(year=self.now.year)
+        return self.cache.get(self.now.year)
+
+    @property
+    def ldate(self):
+        # one calendar answers both date and name lookups
+        return self.lday
 
     def get_cycle(self):
         '''
         returns the lectionary cycle year (1 or 2)
         '''
-        if self.now.year % 2 == 0:
-            even_year = True
-        else:
-            even_year = False
-        if even_year:
-            if self.now.date() > self.lday.get('first sunday of advent')['date']:
-                cycle_year = 'Daily Office Year One'
-            else:
-                cycle_year = 'Daily Office Year Two'
-        else:
-            if self.now.date() < self.lday.get('first sunday of advent')['date']:
-                cycle_year = 'Daily Office Year One'
-            else:
-                cycle_year = 'Daily Office Year Two'
-        return cycle_year
+        if self.row is not None:
+            return self.row[0]
+        return self.lday.tables.cycle(self.now.toordinal())
 
     def get_first_proper(self):
         '''
         first proper after Trinity Sunday
         '''
-        if self.lday.get('PROPER_3')['date'] > date(1970, 1, 1):
-            first_proper = 3
-        elif self.lday.get('PROPER_4')['date'] > date(1970, 1, 1):
-            first_proper = 4
-        elif self.lday.get('PROPER_5')['date'] > date(1970, 1, 1):
-            first_proper = 5
-        elif self.lday.get('PROPER_6')['date'] > date(1970, 1, 1):
-            first_proper = 6
-        elif self.lday.get('PROPER_7')['date'] > date(1970, 1, 1):
-            first_proper = 7
-        else:
-            first_proper = 8
-        return first_proper
+        return self.lday.tables.first_proper
 
     def get_season(self):
         '''
         returns the current season
         '''
-        evening = self.now.time() > time(15, 0)
-        if bool(evening) and self.now.date() == self.lday.get('CHRISTMAS_EVE')['date']:
-            liturgical_season = 'Christmas Season'
-        elif bool(evening) and self.now.date() == self.lday.get('EVE_OF_EPIPHANY')['date']:
-            liturgical_season = 'Epiphany Season'
-        elif self.lday.get('FIRST_SUNDAY_OF_ADVENT')['date'] <= self.now.date() < self.lday.get('CHRISTMAS_DAY')['date']:
-            liturgical_season = 'Advent Season'
-        elif self.now.date() >= self.lday.get('CHRISTMAS_DAY')['date'] or self.now.date() < self.lday.get('THE_EPIPHANY')['date']:
-            liturgical_season = 'Christmas Season'
-        elif self.lday.get('THE_EPIPHANY')['date'] <= self.now.date() < self.lday.get('ASH_WEDNESDAY')['date']:
-            liturgical_season = 'Epiphany Season'
-        elif self.lday.get('ASH_WEDNESDAY')['date'] <= self.now.date() < self.lday.get('EASTER_DAY')['date']:
-            liturgical_season = 'The Lenten Season'
-        elif self.lday.get('EASTER_DAY')['date'] <= self.now.date() <= self.lday.get('TRINITY_SUNDAY')['date']:
-            liturgical_season = 'Easter'
-        else:
-            liturgical_season = 'The Season after Pentecost'
-        return liturgical_season
+        if self.row is not None:
+            return self.row[1]
+        return self.lday.tables.season_at(self.now.toordinal(), self.now.time() > EVENING)
 
     def get_week(self):
         '''
         returns the current week
         '''
-        proper = self.get_first_proper()
-        if self.lday.get('FIRST_SUNDAY_OF_ADVENT')['date'] <= self.now.date() < self.lday.get('SECOND_SUNDAY_OF_ADVENT')['date']:
-            week = 'Week of 1 Advent'
-        elif self.lday.get('SECOND_SUNDAY_OF_ADVENT')['date'] <= self.now.date() < self.lday.get('THIRD_SUNDAY_OF_ADVENT')['date']:
-            week = 'Week of 2 Advent'
-        elif self.lday.get('THIRD_SUNDAY_OF_ADVENT')['date'] <= self.now.date() < self.lday.get('FOURTH_SUNDAY_OF_ADVENT')['date']:
-            week = 'Week of 3 Advent'
-        elif self.lday.get('FOURTH_SUNDAY_OF_ADVENT')['date'] <= self.now.date() < self.lday.get('CHRISTMAS_DAY')['date']:
-            week = 'Week of 4 Advent'
-        elif self.now.date() >= self.lday.get('CHRISTMAS_DAY')['date'] or self.now.date() < self.lday.get('THE_EPIPHANY')['date']:
-            week = 'Christmas Day and Following'
-        elif self.lday.get('THE_EPIPHANY')['date'] <= self.now.date() < self.lday.get('FIRST_SUNDAY_AFTER_EPIPHANY')['date']:
-            week = 'The Epiphany and Following'
-        elif self.lday.get('FIRST_SUNDAY_AFTER_EPIPHANY')['date'] <= self.now.date() < self.lday.get('SECOND_SUNDAY_AFTER_EPIPHANY')['date']:
-            week = 'Week of 1 Epiphany'
-        elif self.lday.get('SECOND_SUNDAY_AFTER_EPIPHANY')['date'] <= self.now.date() < self.lday.get('THIRD_SUNDAY_AFTER_EPIPHANY')['date']:
-            week = 'Week of 2 Epiphany'
-        elif self.lday.get('THIRD_SUNDAY_AFTER_EPIPHANY')['date'] <= self.now.date() < self.lday.get('FOURTH_SUNDAY_AFTER_EPIPHANY')['date']:
-            week = 'Week of 3 Epiphany'
-        elif self.lday.get('FOURTH_SUNDAY_AFTER_EPIPHANY')['date'] <= self.now.date() < self.lday.get('FIFTH_SUNDAY_AFTER_EPIPHANY')['date']:
-            week = 'Week of 4 Epiphany'
-        elif self.lday.get('FIFTH_SUNDAY_AFTER_EPIPHANY')['date'] <= self.now.date() < self.lday.get('SIXTH_SUNDAY_AFTER_EPIPHANY')['date']:
-            week = 'Week of 5 Epiphany'
-        elif self.lday.get('SIXTH_SUNDAY_AFTER_EPIPHANY')['date'] <= self.now.date() < self.lday.get('SEVENTH_SUNDAY_AFTER_EPIPHANY')['date']:
-            week = 'Week of 6 Epiphany'
-        elif self.lday.get('SEVENTH_SUNDAY_AFTER_EPIPHANY')['date'] <= self.now.date() < self.lday.get('EIGHTH_SUNDAY_AFTER_EPIPHANY')['date']:
-            week = 'Week of 7 Epiphany'
-        elif self.lday.get('EIGHTH_SUNDAY_AFTER_EPIPHANY')['date'] <= self.now.date() < self.lday.get('LAST_SUNDAY_AFTER_EPIPHANY')['date']:
-            week = 'Week of 8 Epiphany'
-        elif self.lday.get('LAST_SUNDAY_AFTER_EPIPHANY')['date'] <= self.now.date() < self.lday.get('FIRST_SUNDAY_IN_LENT')['date']:
-            week = 'Week of Last Epiphany'
-        elif self.lday.get('FIRST_SUNDAY_IN_LENT')['date'] <= self.now.date() < self.lday.get('SECOND_SUNDAY_IN_LENT')['date']:
-            week = 'Week of 1 Lent'
-        elif self.lday.get('SECOND_SUNDAY_IN_LENT')['date'] <= self.now.date() < self.lday.get('THIRD_SUNDAY_IN_LENT')['date']:
-            week = 'Week of 2 Lent'
-        elif self.lday.get('THIRD_SUNDAY_IN_LENT')['date'] <= self.now.date() < self.lday.get('FOURTH_SUNDAY_IN_LENT')['date']:
-            week = 'Week of 3 Lent'
-        elif self.lday.get('FOURTH_SUNDAY_IN_LENT')['date'] <= self.now.date() < self.lday.get('FIFTH_SUNDAY_IN_LENT')['date']:
-            week = 'Week of 4 Lent'
-        elif self.lday.get('FIFTH_SUNDAY_IN_LENT')['date'] <= self.now.date() < self.lday.get('PALM_SUNDAY')['date']:
-            week = 'Week of 5 Lent'
-        elif self.lday.get('PALM_SUNDAY')['date'] <= self.now.date() < self.lday.get('EASTER_DAY')['date']:
-            week = 'Holy Week'
-        elif self.lday.get('EASTER_DAY')['date'] <= self.now.date() < self.lday.get('SECOND_SUNDAY_OF_EASTER')['date']:
-            week = 'Easter Week'
-        elif self.lday.get('SECOND_SUNDAY_OF_EASTER')['date'] <= self.now.date() < self.lday.get('THIRD_SUNDAY_OF_EASTER')['date']:
-            week = 'Week of 2 Easter'
-        elif self.lday.get('THIRD_SUNDAY_OF_EASTER')['date'] <= self.now.date() < self.lday.get('FOURTH_SUNDAY_OF_EASTER')['date']:
-            week = 'Week of 3 Easter'
-        elif self.lday.get('FOURTH_SUNDAY_OF_EASTER')['date'] <= self.now.date() < self.lday.get('FIFTH_SUNDAY_OF_EASTER')['date']:
-            week = 'Week of 4 Easter'
-        elif self.lday.get('FIFTH_SUNDAY_OF_EASTER')['date'] <= self.now.date() < self.lday.get('SIXTH_SUNDAY_OF_EASTER')['date']:
-            week = 'Week of 5 Easter'
-        elif self.lday.get('SIXTH_SUNDAY_OF_EASTER')['date'] <= self.now.date() < self.lday.get('SEVENTH_SUNDAY_OF_EASTER')['date']:
-            week = 'Week of 6 Easter'
-        elif self.lday.get('SEVENTH_SUNDAY_OF_EASTER')['date'] <= self.now.date() < self.lday.get('WHITSUNDAY')['date']:
-            week = 'Week of 7 Easter'
-        elif self.lday.get('WHITSUNDAY')['date'] <= self.now.date() < self.lday.get('TRINITY_SUNDAY')['date']:
-            week = 'Week of Proper ' + str(proper-2)
-        elif self.lday.get('TRINITY_SUNDAY')['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper))['date']:
-            week = 'Week of Proper ' + str(proper-1)
-        elif self.lday.get('PROPER_' + str(proper))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+1))['date']:
-            week = 'Week of Proper ' + str(proper)
-        elif self.lday.get('PROPER_' + str(proper+1))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+2))['date']:
-            week = 'Week of Proper ' + str(proper+1)
-        elif self.lday.get('PROPER_' + str(proper+2))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+3))['date']:
-            week = 'Week of Proper ' + str(proper+2)
-        elif self.lday.get('PROPER_' + str(proper+3))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+4))['date']:
-            week = 'Week of Proper ' + str(proper+3)
-        elif self.lday.get('PROPER_' + str(proper+4))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+5))['date']:
-            week = 'Week of Proper ' + str(proper+4)
-        elif self.lday.get('PROPER_' + str(proper+5))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+6))['date']:
-            week = 'Week of Proper ' + str(proper+5)
-        elif self.lday.get('PROPER_' + str(proper+6))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+7))['date']:
-            week = 'Week of Proper ' + str(proper+6)
-        elif self.lday.get('PROPER_' + str(proper+7))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+8))['date']:
-            week = 'Week of Proper ' + str(proper+7)
-        elif self.lday.get('PROPER_' + str(proper+8))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+9))['date']:
-            week = 'Week of Proper ' + str(proper+8)
-        elif self.lday.get('PROPER_' + str(proper+9))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+10))['date']:
-            week = 'Week of Proper ' + str(proper+9)
-        elif self.lday.get('PROPER_' + str(proper+10))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+11))['date']:
-            week = 'Week of Proper ' + str(proper+10)
-        elif self.lday.get('PROPER_' + str(proper+11))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+12))['date']:
-            week = 'Week of Proper ' + str(proper+11)
-        elif self.lday.get('PROPER_' + str(proper+12))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+13))['date']:
-            week = 'Week of Proper ' + str(proper+12)
-        elif self.lday.get('PROPER_' + str(proper+13))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+14))['date']:
-            week = 'Week of Proper ' + str(proper+13)
-        elif self.lday.get('PROPER_' + str(proper+14))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+15))['date']:
-            week = 'Week of Proper ' + str(proper+14)
-        elif self.lday.get('PROPER_' + str(proper+15))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+16))['date']:
-            week = 'Week of Proper ' + str(proper+15)
-        elif self.lday.get('PROPER_' + str(proper+16))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+17))['date']:
-            week = 'Week of Proper ' + str(proper+16)
-        elif self.lday.get('PROPER_' + str(proper+17))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+18))['date']:
-            week = 'Week of Proper ' + str(proper+17)
-        elif self.lday.get('PROPER_' + str(proper+18))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+19))['date']:
-            week = 'Week of Proper ' + str(proper+18)
-        elif self.lday.get('PROPER_' + str(proper+19))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+20))['date']:
-            week = 'Week of Proper ' + str(proper+19)
-        elif self.lday.get('PROPER_' + str(proper+20))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+21))['date']:
-            week = 'Week of Proper ' + str(proper+20)
-        elif self.lday.get('PROPER_' + str(proper+21))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+22))['date']:
-            week = 'Week of Proper ' + str(proper+21)
-        elif self.lday.get('PROPER_' + str(proper+22))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+23))['date']:
-            week = 'Week of Proper ' + str(proper+22)
-        elif self.lday.get('PROPER_' + str(proper+23))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+24))['date']:
-            week = 'Week of Proper ' + str(proper+23)
-        elif self.lday.get('PROPER_' + str(proper+24))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+25))['date']:
-            week = 'Week of Proper ' + str(proper+24)
-        elif self.lday.get('PROPER_' + str(proper+25))['date'] <= self.now.date() < self.lday.get('PROPER_' + str(proper+26))['date']:
-            week = 'Week of Proper ' + str(proper+25)
-        return week
+        if self.row is not None:
+            return self.row[2]
+        return self.lday.tables.week(self.now.toordinal())
 
     def get_day(self):
         '''
         returns relevant holy date or day of week name
         '''
-        evening = self.now.time() > time(15, 0)
-        if self.now.date() in self.ldate:
-            day_dict = self.ldate.get(self.now.date())
-            if evening:
-                day = day_dict['name']
-            elif 'evening' not in day_dict:
-                day = day_dict['name']
-            else:
-                day = day_name[self.now.date().weekday()]
-        else:
-            day = day_name[self.now.date().weekday()]
-        return day
+        if self.row is not None:
+            return self.row[3]
+        return self.lday.observance(self.now.date(), self.now.time() > EVENING)
 
     def get_hour(self):
         '''
         returns the appropriate cannonical hour based on time
         '''
-        test_now = self.now.replace(year=1970, month=1, day=1, tzinfo=None)
-        morning = abs((test_now - datetime(1970, 1, 1, 6, 0)).total_seconds())
-        noonday = abs((test_now - datetime(1970, 1, 1, 12, 0)).total_seconds())
-        evening = abs((test_now - datetime(1970, 1, 1, 18, 0)).total_seconds())
-        compline = abs((test_now - datetime(1970, 1, 1, 21, 0)).total_seconds())
-        diffs = (morning, noonday, evening, compline)
-        hours_enum = diffs.index(min(diffs))
-        if hours_enum == 0:
-            canonical_hour = 'Daily Morning Prayer'
-        elif hours_enum == 1:
-            canonical_hour = 'An Order of Service for Noonday'
-        elif hours_enum == 2:
-            canonical_hour = 'Daily Evening Prayer'
-        elif hours_enum == 3:
-            canonical_hour = 'An Order for Compline'
-        return canonical_hour
+        return canonical_hour(self.now)
+
+    def next_transition(self):
+        '''
+        returns the first moment at which the office may read differently
+        '''
+        return next_transition(self.now)
+
+    def previous_transition(self):
+        '''
+        returns the moment from which the office has read as it does now
+        '''
+        return previous_transition(self.now)
+
+    def seconds_until_transition(self):
+        '''
+        returns the seconds for which this office stays current
+        '''
+        return max((self.next_transition() - self.now).total_seconds(), 0)
+
+    @classmethod
+    def iter_range(cls, start, end, hours=False, at=time(12, 0), cache=calendar_cache):
+        '''
+        yields an Office for every day from start up to, but not including,
+        end: one at the time of day given by at, or one per canonical hour
+        when hours is set; calendars come through a sliding window and the
+        season and week are followed with cursors
+        '''
+        if isinstance(start, datetime):
+            start = start.date()
+        if isinstance(end, datetime):
+            end = end.date()
+        if hours:
+            times = [(moment, name, moment > EVENING) for moment, name in HOURS]
+        else:
+            times = [(at, canonical_hour(at), at > EVENING)]
+        window = CalendarWindow(start.year, cache)
+        year = None
+        ordinal = start.toordinal()
+        stop = end.toordinal()
+        while ordinal < stop:
+            today = date.fromordinal(ordinal)
+            if today.year != year:
+                year = today.year
+                if year not in window.years:
+                    window = window.slide(year)
+                calendar = window.get(year)
+                tables = calendar.tables
+                cycle = tables.cycle.cursor()
+                season = tables.season.cursor()
+                week = tables.week.cursor()
+            cycle_name = cycle(ordinal)
+            week_name = week(ordinal)
+            for moment, hour, evening in times:
+                yield Office(
+                    datetime.combine(today, moment),
+                    cycle_name,
+                    tables.season_at(ordinal, evening, season),
+                    week_name,
+                    calendar.observance(today, evening),
+                    hour,
+                )
+            ordinal += 1
 
 
 if __name__ == '__main__':
-    d = rd(days=0)
+    d = timedelta(days=0)
     test = DailyOffice(now=datetime.now() + d)
     print(test.cycle)
     print(test.season)
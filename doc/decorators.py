@@ -0,0 +1,13 @@
+'''
+View decorators
+'''
+
+
+def session_free(view):
+    '''
+    marks a view that takes every input from its URL, so that the
+    timezone middleware never loads the session for it and its response
+    can be cached by shared caches
+    '''
+    view.session_free = True
+    return view
@@ -0,0 +1,132 @@
+'''
+iCalendar feed
+
+Writes the observances of a range of years, and optionally each
+canonical hour, as iCalendar (RFC 5545) text. The feed is generated one
+year at a time from the cached calendars, so it takes the same memory
+for fifty years as for one, and its bytes depend on nothing but the
+range asked for, the calendar version and FEED_VERSION.
+'''
+
+from datetime import date, datetime, time, timedelta
+
+from doc.converters import HOUR_SLUGS
+from doc.daily_office import EVENING, DailyOffice, Observances, calendar_cache
+
+# bumped whenever the text written for the same calendar changes
+FEED_VERSION = 1
+
+PRODID = '-//dieselpwr//Daily Office Companion//EN'
+UID_DOMAIN = 'daily-office-companion'
+
+# the feed is regenerated on demand, so the stamp is fixed to keep its
+# bytes, and subscribers' copies, unchanged between requests
+DTSTAMP = '20190101T000000Z'
+
+HOUR_LENGTH = timedelta(minutes=30)
+
+SLUGS = {moment: slug for slug, moment in HOUR_SLUGS.items()}
+
+# content lines are folded at 75 octets
+LINE_LENGTH = 75
+
+
+def _text(value):
+    return (value.replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\n', '\\n'))
+
+
+def _fold(line):
+    '''
+    returns line with the CRLF ending, folded so that no part is longer
+    than LINE_LENGTH octets
+    '''
+    if len(line.encode('utf-8')) <= LINE_LENGTH:
+        return line + '\r\n'
+    parts = []
+    part = ''
+    size = 0
+    limit = LINE_LENGTH
+    for character in line:
+        width = len(character.encode('utf-8'))
+        if size + width > limit:
+            parts.append(part)
+            # continuation lines start with a space
+            part = ''
+            size = 0
+            limit = LINE_LENGTH - 1
+        part += character
+        size += width
+    parts.append(part)
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _event(uid, summary, start, end, description=None):
+    lines = [
+        'BEGIN:VEVENT',
+        'UID:{}@{}'.format(uid, UID_DOMAIN),
+        'DTSTAMP:' + DTSTAMP,
+    ]
+    if isinstance(start, datetime):
+        # floating times, kept at the same wall-clock time wherever the
+        # subscriber is
+        lines.append('DTSTART:{:%Y%m%dT%H%M%S}'.format(start))
+        lines.append('DTEND:{:%Y%m%dT%H%M%S}'.format(end))
+    else:
+        lines.append('DTSTART;VALUE=DATE:{:%Y%m%d}'.format(start))
+        lines.append('DTEND;VALUE=DATE:{:%Y%m%d}'.format(end))
+    lines.append('SUMMARY:' + _text(summary))
+    if description:
+        lines.append('DESCRIPTION:' + _text(description))
+    lines.append('END:VEVENT')
+    return ''.join(_fold(line) for line in lines)
+
+
+def feast_event(feast):
+    '''
+    returns the VEVENT of a feast; its UID is made of the date and the
+    feast's key, so it names the same event in any range that holds it
+    '''
+    day = feast.date
+    uid = '{:%Y%m%d}-{}'.format(day, feast.key.lower().replace('_', '-'))
+    description = None
+    if feast.transferred:
+        moved = date.fromordinal(feast.transferred_from)
+        description = 'Transferred from {:%B} {}'.format(moved, moved.day)
+    if feast.evening:
+        start = datetime.combine(day, EVENING)
+        end = datetime.combine(day + timedelta(days=1), time(0, 0))
+        return _event(uid, feast.name, start, end, description)
+    return _event(uid, feast.name, day, day + timedelta(days=1), description)
+
+
+def hour_event(office):
+    '''
+    returns the VEVENT of one canonical hour of the office
+    '''
+    uid = '{:%Y%m%d}-{}'.format(office.now, SLUGS[office.now.time()])
+    description = '\n'.join((office.day, office.week, office.season))
+    return _event(uid, office.hour, office.now, office.now + HOUR_LENGTH, description)
+
+
+def feed(first_year, last_year, hours=False, cache=calendar_cache):
+    '''
+    yields the iCalendar text of the observances from first_year to
+    last_year, and of every canonical hour when hours is set, one year
+    per chunk
+    '''
+    yield ''.join(_fold(line) for line in (
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:' + PRODID,
+        'CALSCALE:GREGORIAN',
+        'X-WR-CALNAME:' + _text('Daily Office'),
+    ))
+    feasts = Observances(cache)
+    for year in range(first_year, last_year + 1):
+        first, end = date(year, 1, 1), date(year + 1, 1, 1)
+        events = [feast_event(feast) for feast in feasts.between(first, end)]
+        if hours:
+            events.extend(hour_event(office) for office in DailyOffice.iter_range(first, end, hours=True, cache=cache))
+        yield ''.join(events)
+    yield _fold('END:VCALENDAR')
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from doc.office_table import write_table
+
+
+class Command(BaseCommand):
+    help = 'Prebuilds the memory-mapped office table used by DailyOffice.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--first-year', type=int, default=1900)
+        parser.add_argument('--last-year', type=int, default=2300)
+        parser.add_argument('--output', default=settings.OFFICE_TABLE)
+
+    def handle(self, *args, **options):
+        days = write_table(options['output'], options['first_year'], options['last_year'])
+        self.stdout.write('Wrote {} days to {}'.format(days, options['output']))
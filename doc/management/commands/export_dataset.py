@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import MAXYEAR, MINYEAR, date
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+from doc.daily_office import DailyOffice
+
+FORMATS = ('jsonl', 'csv')
+
+# one row per date and canonical hour
+COLUMNS = ('date', 'hour', 'cycle', 'season', 'week', 'day')
+
+
+def _rows(first_year, last_year):
+    for office in DailyOffice.iter_range(date(first_year, 1, 1), date(last_year + 1, 1, 1), hours=True):
+        yield (
+            office.now.date().isoformat(), office.hour,
+            office.cycle, office.season, office.week, office.day,
+        )
+
+
+def _export_shard(task):
+    '''
+    resolves every date and hour of a shard of years and returns them as
+    text in the output format
+    '''
+    output_format, first_year, last_year = task
+    if output_format == 'csv':
+        out = io.StringIO()
+        csv.writer(out, lineterminator='\n').writerows(_rows(first_year, last_year))
+        return out.getvalue()
+    return ''.join(
+        json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + '\n'
+        for row in _rows(first_year, last_year)
+    )
+
+
+class Command(BaseCommand):
+    help = 'Writes the resolved office of every date and canonical hour in a range of years as JSON lines or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--first-year', type=int, default=1900)
+        parser.add_argument('--last-year', type=int, default=2099)
+        parser.add_argument('--format', choices=FORMATS, default='jsonl')
+        parser.add_argument('--output', default='-', help='File to write, - for standard output.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--shard-years', type=int, default=10,
+                            help='Years resolved by one task.')
+
+    def handle(self, *args, **options):
+        first, last = options['first_year'], options['last_year']
+        if first > last:
+            raise CommandError('--first-year is after --last-year.')
+        if first <= MINYEAR or last >= MAXYEAR:
+            raise CommandError('Years must be between {} and {}.'.format(MINYEAR + 1, MAXYEAR - 1))
+        if options['workers'] < 1 or options['shard_years'] < 1:
+            raise CommandError('--workers and --shard-years must be positive.')
+
+        size = options['shard_years']
+        tasks = (
+            (options['format'], start, min(start + size - 1, last))
+            for start in range(first, last + 1, size)
+        )
+
+        if options['output'] == '-':
+            out = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', newline='', write_through=True)
+        else:
+            out = open(options['output'], 'w', encoding='utf-8', newline='')
+        try:
+            if options['format'] == 'csv':
+                csv.writer(out, lineterminator='\n').writerow(COLUMNS)
+            self._write(out, tasks, options['workers'])
+        finally:
+            if options['output'] == '-':
+                out.detach()
+            else:
+                out.close()
+
+    def _write(self, out, tasks, workers):
+        '''
+        writes the shards in order as the pool finishes them; at most two
+        shards per worker are in flight or waiting, so memory stays bounded
+        however long the range, and a slow shard holds back the output but
+        never the order
+        '''
+        window = 2 * workers
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            for task in tasks:
+                pending.append(pool.submit(_export_shard, task))
+                if len(pending) >= window:
+                    out.write(pending.popleft().result())
+            while pending:
+                out.write(pending.popleft().result())
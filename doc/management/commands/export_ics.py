@@ -0,0 +1,38 @@
+import sys
+from datetime import MAXYEAR, MINYEAR
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from doc.ics import feed
+
+
+class Command(BaseCommand):
+    help = 'Writes the observances of a range of years, and optionally the canonical hours, as an iCalendar file.'
+
+    def add_arguments(self, parser):
+        year = timezone.now().year
+        parser.add_argument('--first-year', type=int, default=year)
+        parser.add_argument('--last-year', type=int, default=year + 1)
+        parser.add_argument('--hours', action='store_true', help='Add an event for each canonical hour.')
+        parser.add_argument('--output', default='-', help='File to write, - for standard output.')
+
+    def handle(self, *args, **options):
+        first, last = options['first_year'], options['last_year']
+        if first > last:
+            raise CommandError('--first-year is after --last-year.')
+        if first <= MINYEAR or last >= MAXYEAR:
+            raise CommandError('Years must be between {} and {}.'.format(MINYEAR + 1, MAXYEAR - 1))
+
+        chunks = feed(first, last, options['hours'])
+        if options['output'] == '-':
+            # the feed's lines end in CRLF, so bypass newline translation
+            out = sys.stdout.buffer
+            for chunk in chunks:
+                out.write(chunk.encode('utf-8'))
+            out.flush()
+            return
+        with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        self.stdout.write('Wrote {} to {} to {}'.format(first, last, options['output']))
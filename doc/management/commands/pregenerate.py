@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+
+import django
+import pytz
+from dateutil.parser import parse
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpRequest
+from django.template.loader import get_template
+
+from doc.converters import HOUR_SLUGS
+from doc.views import office_context, template_digest
+
+# records the state each date and hour was last rendered from
+MANIFEST = '.pregenerate.json'
+
+TEMPLATES = ('doc/base.html', 'doc/home.html')
+
+
+def _date(value):
+    return parse(value).date()
+
+
+def _page_request():
+    # pages are rendered as the session-free views render them, without
+    # the timezone detector
+    request = HttpRequest()
+    request.timezone_active = True
+    return request
+
+
+def _write(path, content):
+    '''
+    writes content to path unless the file already holds it; returns
+    whether it wrote
+    '''
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = path + '.partial'
+    with open(partial, 'wb') as f:
+        f.write(content)
+    os.replace(partial, path)
+    return True
+
+
+def _render_span(task):
+    '''
+    renders the hour pages of a span of dates for every timezone, skipping
+    dates and hours whose state is unchanged since the last run; returns
+    their digests and the number of files written
+    '''
+    output, first, last, zones, templates, known = task
+    template = get_template('doc/home.html')
+    request = _page_request()
+    digests = {}
+    written = 0
+    day = first
+    while day <= last:
+        for slug, start in HOUR_SLUGS.items():
+            key = '{}/{}'.format(day.isoformat(), slug)
+            wall = datetime.combine(day, start)
+            # pages differ between timezones only in the zone's name
+            state = repr(sorted((name, str(value)) for name, value in office_context(wall).items()))
+            digest = hashlib.sha1((templates + state).encode('utf-8')).hexdigest()
+            digests[key] = digest
+            for zone in zones:
+                path = os.path.join(output, 'office', zone, day.isoformat(), slug, 'index.html')
+                if known.get(key) == digest and os.path.exists(path):
+                    continue
+                context = office_context(pytz.timezone(zone).localize(wall))
+                written += _write(path, template.render(context, request).encode('utf-8'))
+        day += timedelta(days=1)
+    return digests, written
+
+
+class Command(BaseCommand):
+    help = 'Renders the canonical office hour pages to static files.'
+
+    def add_arguments(self, parser):
+        today = date.today()
+        parser.add_argument('--first-date', type=_date, default=today - timedelta(days=1))
+        parser.add_argument('--last-date', type=_date, default=today + timedelta(days=366))
+        parser.add_argument('--timezone', action='append', dest='timezones',
+                            help='May be repeated; defaults to every common timezone.')
+        parser.add_argument('--output', default=settings.OFFICE_SITE_ROOT)
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+
+    def handle(self, *args, **options):
+        output = options['output']
+        first, last = options['first_date'], options['last_date']
+        zones = options['timezones'] or list(pytz.common_timezones)
+        for zone in zones:
+            if zone not in pytz.all_timezones_set:
+                raise CommandError('Unknown timezone {}.'.format(zone))
+        if first > last:
+            raise CommandError('--first-date is after --last-date.')
+
+        # a template edit or calendar change re-renders every page
+        templates = template_digest(*TEMPLATES)
+
+        manifest_path = os.path.join(output, MANIFEST)
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            manifest = {}
+
+        # one task per month, so each worker builds a year's calendar once
+        tasks = []
+        start = first
+        while start <= last:
+            if start.month == 12:
+                end = date(start.year + 1, 1, 1) - timedelta(days=1)
+            else:
+                end = date(start.year, start.month + 1, 1) - timedelta(days=1)
+            end = min(end, last)
+            prefix = start.isoformat()[:7]
+            known = {key: value for key, value in manifest.items() if key.startswith(prefix)}
+            tasks.append((output, start, end, zones, templates, known))
+            start = end + timedelta(days=1)
+
+        written = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as pool:
+            for digests, count in pool.map(_render_span, tasks):
+                manifest.update(digests)
+                written += count
+
+        detect = get_template('doc/detect.html').render({}, _page_request())
+        _write(os.path.join(output, 'index.html'), detect.encode('utf-8'))
+
+        os.makedirs(output, exist_ok=True)
+        partial = manifest_path + '.partial'
+        with open(partial, 'w') as f:
+            json.dump(manifest, f, sort_keys=True)
+        os.replace(partial, manifest_path)
+
+        pages = ((last - first).days + 1) * len(HOUR_SLUGS) * len(zones)
+        self.stdout.write('Wrote {} of {} pages to {}'.format(written, pages, output))
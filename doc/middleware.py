@@ -0,0 +1,67 @@
+'''
+Middleware
+'''
+
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+from tz_detect.middleware import TimezoneMiddleware as DetectTimezoneMiddleware
+
+
+def _use_url_timezone(request):
+    timezone.deactivate()
+    # the view takes its timezone from the URL, so the detector script,
+    # and the CSRF cookie it needs, are left out
+    request.timezone_active = True
+
+
+class SessionFreeMiddleware:
+    '''
+    calls views marked session_free straight away, so that the session,
+    CSRF, authentication, message and timezone middleware listed after
+    this one never run for them; every other request, the admin's
+    included, goes through the full stack
+
+    those other requests are resolved twice, here and again by the
+    handler, which does not reuse a match; a resolve takes 8 to 14
+    microseconds against the 240 to 400 a page takes through WSGI
+    '''
+
+    def __init__(self, get_response):
+        '''
+        initializes the class
+        '''
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            match = resolve(request.path_info, getattr(request, 'urlconf', None))
+        except Resolver404:
+            return self.get_response(request)
+        if not getattr(match.func, 'session_free', False):
+            return self.get_response(request)
+
+        request.resolver_match = match
+        _use_url_timezone(request)
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response = response.render()
+        return response
+
+
+class TimezoneMiddleware(DetectTimezoneMiddleware):
+    '''
+    tz_detect's middleware, run once the view is known so that views
+    marked session_free never touch the session
+    '''
+
+    def process_request(self, request):
+        # a request that never reaches a view, such as a 404, must not
+        # keep the timezone the thread last activated
+        timezone.deactivate()
+        return None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if getattr(view_func, 'session_free', False):
+            _use_url_timezone(request)
+            return None
+        return super().process_request(request)
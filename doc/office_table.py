@@ -0,0 +1,148 @@
+'''
+Prebuilt office table
+
+Resolves cycle, season, week and day for every date in a range once and
+stores them as small integer codes in a flat binary file, with the
+strings kept in a separate intern table. The file is memory-mapped when
+loaded, so worker processes share its pages and never build a calendar
+for a date it covers.
+'''
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date, datetime, time, timedelta
+
+from doc.daily_office import CALENDAR_VERSION, DailyOffice
+
+MAGIC = b'DOCT'
+FORMAT_VERSION = 1
+
+# magic, format version, calendar version, first ordinal, number of days,
+# offset and length of the string table
+HEADER = struct.Struct('<4sHHIIII')
+
+# per-date uint16 codes; the evening columns hold the value after 15:00
+FIELDS = ('cycle', 'season', 'evening_season', 'week', 'day', 'evening_day')
+
+MORNING = time(12, 0)
+EVENING = time(16, 0)
+
+
+def write_table(path, first_year, last_year):
+    '''
+    resolves every date from first_year to last_year and writes the table
+    '''
+    strings = []
+    interned = {}
+
+    def intern(value):
+        code = interned.get(value)
+        if code is None:
+            code = interned[value] = len(strings)
+            strings.append(value)
+        return code
+
+    codes = array('H')
+    day = date(first_year, 1, 1)
+    last = date(last_year, 12, 31)
+    while day <= last:
+        morning = DailyOffice(now=datetime.combine(day, MORNING), table=False)
+        evening = DailyOffice(now=datetime.combine(day, EVENING), table=False)
+        codes.extend((
+            intern(morning.cycle),
+            intern(morning.season),
+            intern(evening.season),
+            intern(morning.week),
+            intern(morning.day),
+            intern(evening.day),
+        ))
+        day += timedelta(days=1)
+
+    if sys.byteorder != 'little':
+        codes.byteswap()
+    blob = '\0'.join(strings).encode('utf-8')
+    count = len(codes) // len(FIELDS)
+    offset = HEADER.size + len(codes) * codes.itemsize
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, CALENDAR_VERSION,
+        date(first_year, 1, 1).toordinal(), count, offset, len(blob),
+    )
+    # write beside the target and swap it in, so processes that still map
+    # the old file keep a consistent view
+    partial = path + '.partial'
+    with open(partial, 'wb') as f:
+        f.write(header)
+        codes.tofile(f)
+        f.write(blob)
+    os.replace(partial, path)
+    return count
+
+
+class OfficeTable:
+    '''
+    memory-mapped table of resolved days
+    '''
+
+    def __init__(self, path):
+        '''
+        maps the file and checks its header
+        '''
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, calendar_version, first, days, offset, length = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError('{} is not a version {} office table.'.format(path, FORMAT_VERSION))
+        if calendar_version != CALENDAR_VERSION:
+            self.close()
+            raise ValueError('{} was built for calendar version {}, not {}.'.format(
+                path, calendar_version, CALENDAR_VERSION))
+        self.path = path
+        self.first = first
+        self.days = days
+        self.strings = tuple(self._mmap[offset:offset + length].decode('utf-8').split('\0'))
+        codes = memoryview(self._mmap)[HEADER.size:offset]
+        if sys.byteorder == 'little':
+            self.codes = codes.cast('H')
+        else:
+            self.codes = array('H', codes.tobytes())
+            self.codes.byteswap()
+
+    def __len__(self):
+        return self.days
+
+    def __contains__(self, key):
+        if isinstance(key, datetime):
+            key = key.date()
+        return 0 <= key.toordinal() - self.first < self.days
+
+    def lookup(self, now):
+        '''
+        returns (cycle, season, week, day) for a datetime, or None when the
+        date is outside the table
+        '''
+        index = now.toordinal() - self.first
+        if not 0 <= index < self.days:
+            return None
+        codes = self.codes
+        strings = self.strings
+        row = index * len(FIELDS)
+        evening = now.time() > time(15, 0)
+        return (
+            strings[codes[row]],
+            strings[codes[row + (2 if evening else 1)]],
+            strings[codes[row + 3]],
+            strings[codes[row + (5 if evening else 4)]],
+        )
+
+    def close(self):
+        '''
+        releases the mapping
+        '''
+        codes = getattr(self, 'codes', None)
+        if isinstance(codes, memoryview):
+            codes.release()
+        self._mmap.close()
@@ -1,7 +0,0 @@
-setTimeout(function () {
-    if (location.protocol !== "https:") {
-      location.protocol = "https:";
-    } else {
-      window.location.replace("/home");
-    };
-  }, 1000);
\ No newline at end of file
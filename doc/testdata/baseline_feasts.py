@@ -0,0 +1,60 @@
+'''
+writes the fixture of feast dates the rule table is tested against
+
+Lists every feast of a few years, in table order, and digests the feasts
+of every year Easter is tabulated for, as the daily_office.py given
+builds them; for the saved fixture that is the one the calendar started
+from, before the rule table:
+
+    git show dce2527:doc/daily_office.py > /tmp/first_office.py
+    python doc/testdata/baseline_feasts.py /tmp/first_office.py > doc/testdata/baseline_feasts.json
+
+A feast is written as one line of its key, name, date (1 January 1970
+when absent from the year, the first calendar's mark and ABSENT now) and
+whether it is kept in the evening, split by |.
+'''
+
+import hashlib
+import importlib.util
+import json
+import sys
+
+FIRST_YEAR = 1583
+LAST_YEAR = 4099
+YEARS = (1583, 1900, 1943, 2000, 2001, 2019, 2038, 2100, 2285, 4099)
+
+
+def line(feast):
+    return '|'.join(map(str, feast))
+
+
+def digest(feasts):
+    lines = hashlib.sha1()
+    for feast in feasts:
+        lines.update('{}\n'.format(line(feast)).encode('utf-8'))
+    return lines.hexdigest()
+
+
+def main(path):
+    spec = importlib.util.spec_from_file_location('first_office', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    def feasts(year):
+        # the first calendar keyed by name when switched
+        calendar = module.LiturgicalDay(year, switch=True)
+        return [
+            (key, feast['name'], feast['date'].isoformat(), bool(feast.get('evening')))
+            for key, feast in calendar.items()
+        ]
+
+    fixture = {
+        'feasts': {year: [line(feast) for feast in feasts(year)] for year in YEARS},
+        'digests': {year: digest(feasts(year)) for year in range(FIRST_YEAR, LAST_YEAR + 1)},
+    }
+    json.dump(fixture, sys.stdout, indent=1, sort_keys=True)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1])
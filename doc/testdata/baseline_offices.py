@@ -0,0 +1,79 @@
+'''
+writes the fixture of resolved offices the tests compare against
+
+Resolves the office at 09:00 and 16:00 of every date from 1900 to 2299
+with the daily_office.py given, which for the saved fixture is the one
+the calendar started from, before it was reworked:
+
+    git show dce2527:doc/daily_office.py > /tmp/first_office.py
+    python doc/testdata/baseline_offices.py /tmp/first_office.py > doc/testdata/baseline_offices.json
+
+That calendar raised for the last week before Advent in most years; the
+dates it raised on are listed in failed and left out of the digests.
+Each year has two digests, one of every field and one of the fields that
+feast transfers leave alone (all but the day).
+'''
+
+import hashlib
+import importlib.util
+import json
+import sys
+from datetime import date, datetime, time, timedelta
+
+FIRST_YEAR = 1900
+LAST_YEAR = 2299
+TIMES = (time(9, 0), time(16, 0))
+
+
+def line(now, fields):
+    return '{:%Y-%m-%dT%H:%M} {}\n'.format(now, '|'.join(map(str, fields))).encode('utf-8')
+
+
+def digests(year, office):
+    '''
+    returns the digests of a year's offices and the first and last dates
+    office raised on; office maps a datetime to (cycle, season, week, day,
+    hour), or None where it raised
+    '''
+    offices = hashlib.sha1()
+    boundaries = hashlib.sha1()
+    failed = []
+    day = date(year, 1, 1)
+    while day.year == year:
+        for moment in TIMES:
+            now = datetime.combine(day, moment)
+            fields = office(now)
+            if fields is None:
+                failed.append(day)
+                continue
+            offices.update(line(now, fields))
+            boundaries.update(line(now, fields[:3] + fields[4:]))
+        day += timedelta(days=1)
+    return offices.hexdigest(), boundaries.hexdigest(), failed
+
+
+def main(path):
+    spec = importlib.util.spec_from_file_location('first_office', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    def office(now):
+        try:
+            resolved = module.DailyOffice(now=now)
+        except Exception:
+            return None
+        return resolved.cycle, resolved.season, resolved.week, resolved.day, resolved.hour
+
+    fixture = {'offices': {}, 'boundaries': {}, 'failed': {}}
+    for year in range(FIRST_YEAR, LAST_YEAR + 1):
+        offices, boundaries, failed = digests(year, office)
+        fixture['offices'][year] = offices
+        fixture['boundaries'][year] = boundaries
+        if failed:
+            fixture['failed'][year] = [failed[0].isoformat(), failed[-1].isoformat()]
+    json.dump(fixture, sys.stdout, indent=1, sort_keys=True)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1])
@@ -1,3 +1,575 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from calendar import day_name
+from datetime import date, datetime, timedelta
+from unittest import mock, skipIf
 
-# Create your tests here.
+import pytz
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from doc.daily_office import (
+    EVENING, RULES, DailyOffice, LiturgicalDay, build_year, calendar_cache, compile_rules, next_transition,
+    previous_transition,
+)
+from doc.office_table import HEADER, OfficeTable, write_table
+
+try:
+    import numpy as np
+    from doc import batch
+except ImportError:
+    # the batch resolver needs numpy, from requirements-batch.txt
+    np = batch = None
+from doc.testdata import baseline_feasts
+from doc.testdata.baseline_offices import FIRST_YEAR, LAST_YEAR, digests
+
+TESTDATA = os.path.join(os.path.dirname(__file__), 'testdata')
+
+with open(os.path.join(TESTDATA, 'baseline_offices.json')) as fixture:
+    BASELINE = json.load(fixture)
+
+with open(os.path.join(TESTDATA, 'baseline_feasts.json')) as fixture:
+    BASELINE_FEASTS = json.load(fixture)
+
+
+class UntransferredDay(LiturgicalDay):
+    '''
+    the calendar as first written: every feast where its rule puts it,
+    none transferred or carried into the next year
+    '''
+
+    def _populate(self, year):
+        dict.update(self, [(feast.key, feast) for feast in build_year(year)])
+
+
+def feast_fields(feasts):
+    return [(feast.key, feast.name, feast.date.isoformat(), feast.evening) for feast in feasts]
+
+
+def resolved(office):
+    return office.cycle, office.season, office.week, office.day, office.hour
+
+
+class BaselineTests(SimpleTestCase):
+    '''
+    the reworked calendar against the offices of the one it started from,
+    saved as digests in testdata/baseline_offices.json; offices here are
+    resolved from calendars, whatever office table is installed
+    '''
+
+    def offices(self, year, calendar=None):
+        '''
+        returns a function resolving the offices of a year, or None on the
+        dates the first calendar raised on
+        '''
+        failed = BASELINE['failed'].get(str(year))
+        first, last = (date(*map(int, day.split('-'))) for day in failed) if failed else (None, None)
+
+        def office(now):
+            if failed and first <= now.date() <= last:
+                return None
+            fields = resolved(DailyOffice(now=now, calendar=calendar, table=False))
+            feasts = (calendar or calendar_cache.get(now.year)).dates.get(now.date())
+            # the first calendar let an eve kept only in the evening take
+            # its whole date, naming the weekday before the cutoff
+            if feasts and feasts[-1].evening and now.time() <= EVENING:
+                fields = fields[:3] + (day_name[now.weekday()],) + fields[4:]
+            return fields
+        return office
+
+    def test_boundaries(self):
+        # cycle, season, week and hour come from the boundary tables, which
+        # transfers leave alone
+        for year in range(FIRST_YEAR, LAST_YEAR + 1):
+            offices, boundaries, failed = digests(year, self.offices(year))
+            self.assertEqual(boundaries, BASELINE['boundaries'][str(year)], year)
+
+    def test_untransferred_offices(self):
+        # without transfers, the rule table gives every feast its old date
+        for year in range(FIRST_YEAR, LAST_YEAR + 1):
+            offices, boundaries, failed = digests(year, self.offices(year, UntransferredDay(year)))
+            self.assertEqual(offices, BASELINE['offices'][str(year)], year)
+
+
+class RuleTableTests(SimpleTestCase):
+    '''
+    the compiled rule table against the feasts of the calendar it
+    replaced, saved in testdata/baseline_feasts.json
+    '''
+
+    def test_feasts_of_fixed_years(self):
+        for year, expected in BASELINE_FEASTS['feasts'].items():
+            feasts = [baseline_feasts.line(feast) for feast in feast_fields(build_year(int(year)))]
+            self.assertEqual(feasts, expected, year)
+
+    def test_every_tabulated_year(self):
+        for year in range(baseline_feasts.FIRST_YEAR, baseline_feasts.LAST_YEAR + 1):
+            digest = baseline_feasts.digest(feast_fields(build_year(year)))
+            self.assertEqual(digest, BASELINE_FEASTS['digests'][str(year)], year)
+
+    def test_compiling_again(self):
+        # a table compiled afresh builds the same feasts, in table order
+        build = compile_rules(RULES)
+        for year in (1, 1582, 2019, 9999):
+            self.assertEqual(build(year), build_year(year))
+            self.assertEqual([feast.key for feast in build(year)], [rule.key for rule in RULES])
+
+
+class TransferTests(SimpleTestCase):
+
+    def test_annunciation_on_a_sunday(self):
+        calendar = LiturgicalDay(2001)
+        feast = calendar['THE_ANNUNCIATION']
+        self.assertEqual(feast.date, date(2001, 3, 26))
+        self.assertEqual(feast.transferred_from, date(2001, 3, 25).toordinal())
+        self.assertEqual(DailyOffice(now=datetime(2001, 3, 26, 9), table=False).day, feast.name)
+        self.assertEqual(DailyOffice(now=datetime(2001, 3, 25, 9), table=False).day, 'Fourth Sunday in Lent')
+
+    def test_eve_moves_with_its_feast(self):
+        calendar = LiturgicalDay(2001)
+        eve = calendar['EVE_OF_THE_ANNUNCIATION']
+        self.assertEqual(eve.date, date(2001, 3, 25))
+        self.assertEqual(eve.transferred_from, date(2001, 3, 24).toordinal())
+        self.assertEqual(calendar.feasts_on(date(2001, 3, 24)), [])
+        self.assertEqual(DailyOffice(now=datetime(2001, 3, 24, 16), table=False).day, 'Saturday')
+        # the Sunday keeps its evening; the eve is commemorated
+        self.assertEqual(calendar.commemorations(date(2001, 3, 25)), [eve])
+        self.assertEqual(DailyOffice(now=datetime(2001, 3, 25, 16), table=False).day, 'Fourth Sunday in Lent')
+
+    def test_sundays_after_christmas_carried_into_january(self):
+        self.assertEqual(DailyOffice(now=datetime(2022, 1, 2, 9), table=False).day, 'Second Sunday after Christmas Day')
+        self.assertNotIn(date(2022, 1, 2), calendar_cache.get(2021).dates)
+        self.assertEqual(
+            [feast.key for feast in calendar_cache.get(2023).commemorations(date(2023, 1, 1))],
+            ['FIRST_SUNDAY_AFTER_CHRISTMAS'],
+        )
+        self.assertEqual(DailyOffice(now=datetime(2023, 1, 1, 9), table=False).day, 'The Holy Name of Our Lord Jesus Christ')
+
+    def test_eves_give_way_before_the_evening(self):
+        for morning, day in (
+            (datetime(2023, 12, 24, 9), 'Fourth Sunday of Advent'),
+            (datetime(2006, 12, 24, 9), 'Fourth Sunday of Advent'),
+            (datetime(2017, 12, 24, 9), 'Fourth Sunday of Advent'),
+            (datetime(2020, 1, 5, 9), 'Second Sunday after Christmas Day'),
+            (datetime(2025, 1, 5, 9), 'Second Sunday after Christmas Day'),
+        ):
+            self.assertEqual(DailyOffice(now=morning, table=False).day, day, morning)
+        self.assertEqual(DailyOffice(now=datetime(2023, 12, 24, 16), table=False).day, 'Christmas Eve')
+        self.assertEqual(DailyOffice(now=datetime(2020, 1, 5, 16), table=False).day, 'Eve of Epiphany')
+
+    def test_eves_displace_nothing(self):
+        # the eve of Pentecost fell on the Visitation in 1653
+        calendar = LiturgicalDay(1653)
+        self.assertEqual(calendar['THE_VISITATION'].date, date(1653, 5, 31))
+        self.assertFalse(calendar['THE_VISITATION'].transferred)
+        self.assertEqual(DailyOffice(now=datetime(1653, 5, 31, 9), table=False).day, 'The Visitation of the Blessed Virgin Mary')
+        self.assertEqual(DailyOffice(now=datetime(1653, 5, 31, 16), table=False).day, 'Eve of Pentecost')
+
+    def test_differences_are_transfers(self):
+        # an office differs from the untransferred one only in its day, and
+        # only where a feast was transferred or carried to, or an eve moved
+        # away from
+        for year in range(1990, 2041):
+            calendar = calendar_cache.get(year)
+            untransferred = UntransferredDay(year)
+            moved_eves = {feast.transferred_from for feast in calendar.values() if feast.evening}
+            day = date(year, 1, 1)
+            while day.year == year:
+                for hour in (9, 16):
+                    now = datetime(year, day.month, day.day, hour)
+                    expected = resolved(DailyOffice(now=now, calendar=untransferred, table=False))
+                    got = resolved(DailyOffice(now=now, calendar=calendar, table=False))
+                    if got == expected:
+                        continue
+                    self.assertEqual(got[:3] + got[4:], expected[:3] + expected[4:], now)
+                    self.assertTrue(
+                        any(got[3] == feast.name and (feast.transferred or feast in calendar.carried)
+                            for feast in calendar.dates.get(day, ()))
+                        or day.toordinal() in moved_eves,
+                        now,
+                    )
+                day += timedelta(days=1)
+
+
+class TransitionTests(SimpleTestCase):
+
+    def assertConstant(self, now, tz):
+        '''
+        checks that the office reads the same from the previous transition
+        up to the next
+        '''
+        first = previous_transition(now)
+        following = next_transition(now)
+        self.assertLessEqual(first, now)
+        self.assertLess(now, following)
+        middle = first + (following - first) / 2
+        offices = {
+            resolved(DailyOffice(now=moment.astimezone(tz).replace(tzinfo=None), table=False))
+            for moment in (first, middle, now, following - timedelta(microseconds=1))
+        }
+        self.assertEqual(len(offices), 1, now)
+
+    def test_clock_changes(self):
+        # New York changes at 02:00; Santiago at midnight, so one day has
+        # no midnight and another two
+        for zone, changes in (
+            ('America/New_York', (datetime(2019, 3, 10, 7), datetime(2019, 11, 3, 6))),
+            ('America/Santiago', (datetime(2019, 4, 7, 3), datetime(2019, 9, 8, 4))),
+        ):
+            tz = pytz.timezone(zone)
+            for change in changes:
+                for step in range(-36 * 6, 36 * 6):
+                    now = pytz.utc.localize(change + timedelta(minutes=10 * step + 3))
+                    self.assertConstant(now.astimezone(tz), tz)
+
+    def test_transition_at_clock_change(self):
+        tz = pytz.timezone('America/New_York')
+        now = tz.localize(datetime(2019, 3, 10, 1, 30))
+        self.assertEqual(next_transition(now), pytz.utc.localize(datetime(2019, 3, 10, 7)))
+        later = tz.normalize(now + timedelta(hours=1))
+        self.assertEqual(previous_transition(later), pytz.utc.localize(datetime(2019, 3, 10, 7)))
+
+    def test_naive(self):
+        now = datetime(2019, 12, 24, 12)
+        self.assertEqual(previous_transition(now), datetime(2019, 12, 24, 9, 0, 0, 1))
+        self.assertEqual(next_transition(now), datetime(2019, 12, 24, 15, 0, 0, 1))
+
+
+class KeyTests(SimpleTestCase):
+
+    def test_keys(self):
+        calendar = LiturgicalDay(2019)
+        christmas = calendar['CHRISTMAS_DAY']
+        for key in (
+            'christmas day', date(2019, 12, 25), datetime(2019, 12, 25, 9), '2019-12-25',
+            '2019-12-25T09:00:00', '2019-12-25 23:59:59.5', '2019-12-25T09:00+05:30', '2019-12-25T09Z',
+            'Dec 25 2019', 1577264400, 1577264400.5,
+        ):
+            self.assertIs(calendar[key], christmas, key)
+
+    def test_not_a_date(self):
+        calendar = LiturgicalDay(2019)
+        for key in ('2019-12-25T25:00', '2019-12-25T09:60', '2019-12-25 not a time', '2019-02-30', 'PROPER_30'):
+            self.assertIsNone(calendar.get(key), key)
+            with self.assertRaises(KeyError):
+                calendar[key]
+
+
+class DailyOfficeTests(SimpleTestCase):
+
+    def test_calendar_overrides_table(self):
+        now = datetime(2001, 3, 26, 9)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'office_table.bin')
+            write_table(path, 2001, 2001)
+            table = OfficeTable(path)
+            try:
+                with mock.patch.object(DailyOffice, 'table', table):
+                    self.assertIsNotNone(DailyOffice(now=now).row)
+                    self.assertIsNone(DailyOffice(now=now, cache=None).row)
+                    office = DailyOffice(now=now, calendar=UntransferredDay(2001))
+                    self.assertIsNone(office.row)
+                    # untransferred, the Annunciation stays on the Sunday
+                    self.assertEqual(office.day, 'Monday')
+            finally:
+                table.close()
+
+
+@skipIf(batch is None, 'numpy is not installed')
+class BatchTests(SimpleTestCase):
+
+    def assertResolves(self, result, local_times):
+        self.assertEqual(len(result), len(local_times))
+        fields = [result.decode(field) for field in result.FIELDS]
+        for index, now in enumerate(local_times):
+            expected = resolved(DailyOffice(now=now, table=False))
+            self.assertEqual(tuple(column[index] for column in fields), expected, now)
+
+    def test_wall_times(self):
+        # either side of the evening cutoff and of each canonical hour
+        edges = [timedelta(hours=hours, minutes=minutes) for hours, minutes in ((9, 0), (15, 0), (19, 30))]
+        offsets = [timedelta(0), timedelta(hours=12), timedelta(hours=23, minutes=59, seconds=59, microseconds=999999)]
+        for edge in edges:
+            offsets.extend((edge - timedelta(microseconds=1), edge, edge + timedelta(microseconds=1)))
+        local_times = [
+            datetime.combine(day, datetime.min.time()) + offset
+            for day in (date(2019, 12, 24), date(2019, 12, 31), date(2020, 1, 5), date(2023, 12, 24), date(2001, 3, 26))
+            for offset in offsets
+        ]
+        result = batch.resolve(np.array(local_times, dtype='datetime64[us]'))
+        self.assertResolves(result, local_times)
+
+    def test_utc_instants(self):
+        # every quarter hour across New York's clock changes
+        tz = pytz.timezone('America/New_York')
+        instants = []
+        for start in (datetime(2019, 3, 9, 12), datetime(2019, 11, 2, 12)):
+            instants.extend(start + timedelta(minutes=15 * step) for step in range(2 * 96))
+        local_times = [pytz.utc.localize(instant).astimezone(tz).replace(tzinfo=None) for instant in instants]
+        result = batch.resolve(np.array(instants, dtype='datetime64[us]'), tz)
+        self.assertResolves(result, local_times)
+
+    def test_empty(self):
+        empty = np.array([], dtype='datetime64[us]')
+        self.assertEqual(len(batch.resolve(empty)), 0)
+        self.assertEqual(len(batch.resolve(empty, pytz.timezone('America/New_York'))), 0)
+
+
+class OfficeTableTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'office_table.bin')
+
+    def test_lookup(self):
+        self.assertEqual(write_table(self.path, 2023, 2024), 731)
+        table = OfficeTable(self.path)
+        self.addCleanup(table.close)
+        day = date(2023, 1, 1)
+        while day.year < 2025:
+            for hour in (9, 16):
+                now = datetime(day.year, day.month, day.day, hour)
+                self.assertEqual(table.lookup(now), resolved(DailyOffice(now=now, table=False))[:4], now)
+            day += timedelta(days=1)
+        self.assertIsNone(table.lookup(datetime(2022, 12, 31, 9)))
+        self.assertIsNone(table.lookup(datetime(2025, 1, 1, 9)))
+
+    def test_stale_calendar(self):
+        write_table(self.path, 2023, 2023)
+        with open(self.path, 'r+b') as f:
+            header = list(HEADER.unpack(f.read(HEADER.size)))
+            # the calendar version follows the magic and format version
+            header[2] += 1
+            f.seek(0)
+            f.write(HEADER.pack(*header))
+        with self.assertRaises(ValueError):
+            OfficeTable(self.path)
+
+
+class ExportDatasetTests(SimpleTestCase):
+
+    def export(self, output_format, workers, shard_years):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'offices')
+            call_command(
+                'export_dataset', first_year=2019, last_year=2021, format=output_format,
+                output=path, workers=workers, shard_years=shard_years,
+            )
+            with open(path, 'rb') as f:
+                return f.read()
+
+    def test_same_bytes_however_sharded(self):
+        for output_format in ('jsonl', 'csv'):
+            expected = self.export(output_format, 1, 3)
+            # four canonical hours a day, and the CSV header
+            rows = 4 * 1096 + (output_format == 'csv')
+            self.assertEqual(expected.count(b'\n'), rows, output_format)
+            for workers, shard_years in ((1, 1), (2, 1), (3, 2)):
+                self.assertEqual(self.export(output_format, workers, shard_years), expected, (workers, shard_years))
+
+
+class OfficeApiTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, **headers):
+        return self.client.get('/api/office', {'at': '2019-12-25T10:00', 'tz': 'America/New_York'}, **headers)
+
+    def test_office(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['day'], 'The Nativity of Our Lord Jesus Christ')
+        self.assertTrue(response['ETag'].startswith('"'))
+        # the morning office began at 09:00 New York time
+        self.assertEqual(response['Last-Modified'], 'Wed, 25 Dec 2019 14:00:00 GMT')
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_if_none_match(self):
+        etag = self.get()['ETag']
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_if_modified_since(self):
+        last_modified = self.get()['Last-Modified']
+        self.assertEqual(self.get(HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_changed_office(self):
+        etag = self.get()['ETag']
+        response = self.client.get(
+            '/api/office', {'at': '2019-12-25T16:00', 'tz': 'America/New_York'}, HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_session_timezone_is_private(self):
+        response = self.client.get('/api/office', {'at': '2019-12-25T10:00'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_bad_parameters(self):
+        for params in (
+            {'at': 'tomorrowish'},
+            {'at': '2019-12-25T10:00', 'tz': 'Nowhere/Special'},
+        ):
+            response = self.client.get('/api/office', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertNotIn('year', response.json()['error'])
+        for params in (
+            {'at': '9999-06-01T12:00', 'tz': 'UTC'},
+            {'at': '0001-06-01T12:00', 'tz': 'UTC'},
+        ):
+            response = self.client.get('/api/office', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('year 2 to 9998', response.json()['error'])
+
+    def test_clock_changes(self):
+        # 02:30 is skipped and 01:30 repeated in New York; both are read
+        # as standard time, just after the clock changed
+        for at, last_modified in (
+            ('2019-03-10T02:30', 'Sun, 10 Mar 2019 07:00:00 GMT'),
+            ('2019-11-03T01:30', 'Sun, 03 Nov 2019 06:00:00 GMT'),
+        ):
+            response = self.client.get('/api/office', {'at': at, 'tz': 'America/New_York'})
+            self.assertEqual(response.status_code, 200, at)
+            self.assertEqual(response['Last-Modified'], last_modified, at)
+
+
+class CookieFreeTestCase(TestCase):
+    '''
+    pages that depend on nothing but their URL are answered without the
+    session, so shared caches may keep them
+    '''
+
+    def setUp(self):
+        cache.clear()
+        # a returning visitor sends their session cookie with every request
+        self.client.cookies['sessionid'] = 'abc'
+
+    def assertCookieFree(self, url):
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        self.assertEqual(response.cookies, {}, url)
+        self.assertNotIn('Cookie', response.get('Vary', ''), url)
+        self.assertIn('public', response['Cache-Control'], url)
+        return response
+
+    def assertNotModified(self, url):
+        etag = self.assertCookieFree(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304, url)
+
+
+class OfficePageTests(CookieFreeTestCase):
+
+    def test_cookie_free(self):
+        for url in (
+            '/office/America/New_York/2019-12-25',
+            '/office/America/New_York/2019-12-25/morning',
+            '/office/Asia/Tokyo/0002-01-01/evening',
+            '/office/UTC/9998-12-31/compline',
+        ):
+            self.assertCookieFree(url)
+
+    def test_out_of_range(self):
+        for url in (
+            '/office/UTC/9999-01-01',
+            '/office/UTC/0001-12-31/morning',
+            '/office/Nowhere/Special/2019-12-25',
+            '/office/america/new_york/2019-12-25',
+            '/office/utc/2019-12-25/morning',
+            '/office/UTC/2019-02-30',
+        ):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+
+
+class DetectTests(CookieFreeTestCase):
+
+    def assertRedirectsToOffice(self, query, zone):
+        response = self.client.get('/', query)
+        self.assertEqual(response.status_code, 302, query)
+        self.assertRegex(response['Location'], r'^/office/{}/\d{{4}}-\d{{2}}-\d{{2}}/[a-z]+$'.format(zone))
+        self.assertEqual(self.client.get(response['Location']).status_code, 200, query)
+
+    def test_detector_page(self):
+        self.assertCookieFree('/')
+
+    def test_named_zone(self):
+        self.assertRedirectsToOffice({'tz': 'America/New_York', 'offset': '300'}, 'America/New_York')
+        self.assertRedirectsToOffice({'tz': 'asia/tokyo', 'offset': '-540'}, 'Asia/Tokyo')
+
+    def test_unknown_zone_falls_back_to_offset(self):
+        # ICU names the zone of an unconfigured system Etc/Unknown
+        self.assertRedirectsToOffice({'tz': 'Etc/Unknown', 'offset': '0'}, '[A-Za-z_/]+')
+        self.assertRedirectsToOffice({'offset': '-60'}, '[A-Za-z_/]+')
+
+    def test_bad_offset(self):
+        for query in ({'tz': 'Etc/Unknown'}, {'offset': 'east'}):
+            self.assertEqual(self.client.get('/', query).status_code, 400, query)
+
+
+class SessionFreeTests(CookieFreeTestCase):
+
+    def test_no_timezone_left_active(self):
+        # a request that never reaches a view does not keep the timezone an
+        # earlier request on the thread activated
+        timezone.activate('Asia/Tokyo')
+        self.assertEqual(self.client.get('/office/UTC/9999-01-01').status_code, 404)
+        self.assertEqual(timezone.get_current_timezone_name(), settings.TIME_ZONE)
+
+    def test_session_views_still_use_the_session(self):
+        response = self.client.get('/home')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+
+
+class OfficeJsonTests(CookieFreeTestCase):
+
+    def test_route(self):
+        url = reverse('doc_office_json', kwargs={'tz': 'America/New_York', 'day': date(2019, 12, 25), 'hour': 'morning'})
+        self.assertEqual(url, '/office/America/New_York/2019-12-25/morning.json')
+        office = self.assertCookieFree(url).json()
+        api = self.client.get('/api/office', {'at': '2019-12-25T09:00', 'tz': 'America/New_York'}).json()
+        self.assertEqual(office, api)
+
+    def test_if_none_match(self):
+        self.assertNotModified('/office/America/New_York/2019-12-25/morning.json')
+        self.assertNotModified('/office/UTC/9998-12-31/compline.json')
+
+    def test_out_of_range(self):
+        self.assertEqual(self.client.get('/office/UTC/9999-06-01/morning.json').status_code, 404)
+
+
+class CalendarPageTests(CookieFreeTestCase):
+
+    def test_if_none_match(self):
+        self.assertNotModified('/calendar/2019')
+        self.assertNotModified('/calendar/2019/12')
+
+    def test_out_of_range(self):
+        for url in ('/calendar/9999', '/calendar/2019/13', '/calendar/1/1'):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+
+
+class CalendarFeedTests(CookieFreeTestCase):
+
+    def test_feed(self):
+        response = self.assertCookieFree('/calendar.ics?first=2019&last=2020')
+        feed = b''.join(response.streaming_content).decode('utf-8')
+        self.assertTrue(feed.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertIn('UID:20191225-christmas-day@', feed)
+
+    def test_if_none_match(self):
+        self.assertNotModified('/calendar.ics?first=2019&last=2020')
+
+    def test_bad_range(self):
+        for query in ('first=2020&last=2019', 'first=1&last=2', 'first=2000&last=2100', 'first=year'):
+            self.assertEqual(self.client.get('/calendar.ics?' + query).status_code, 400, query)
@@ -1,7 +1,19 @@
-from django.urls import path, include
-from doc import views
+from django.urls import path, include, register_converter
+from doc import converters, views
+
+register_converter(converters.TimezoneConverter, 'tz')
+register_converter(converters.DateConverter, 'date')
+register_converter(converters.HourConverter, 'hour')
 
 urlpatterns = [
     path('', views.detect, name='doc_detect'),
     path('home', views.home, name='doc_home'),
+    path('api/office', views.office_api, name='doc_office_api'),
+    path('api/cache-stats', views.cache_stats, name='doc_cache_stats'),
+    path('office/<tz:tz>/<date:day>', views.office, name='doc_office'),
+    path('office/<tz:tz>/<date:day>/<hour:hour>', views.office, name='doc_office_hour'),
+    path('office/<tz:tz>/<date:day>/<hour:hour>.json', views.office_json, name='doc_office_json'),
+    path('calendar.ics', views.calendar_feed, name='doc_calendar_feed'),
+    path('calendar/<int:year>', views.calendar_year, name='doc_calendar_year'),
+    path('calendar/<int:year>/<int:month>', views.calendar_month, name='doc_calendar_month'),
 ]
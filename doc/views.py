@@ -1,38 +1,454 @@
+import hashlib
+from calendar import SUNDAY, Calendar, day_abbr, day_name, timegm
+from collections import OrderedDict, namedtuple
+from datetime import MAXYEAR, MINYEAR, date, datetime, time
+from functools import lru_cache
+
+import pytz
+from django.core.cache import cache
 from django.utils import timezone
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django.utils.text import slugify
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag, urlencode
+from django.contrib.admin.views.decorators import staff_member_required
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+from django.template.loader import get_template
 from django.shortcuts import render, redirect, get_object_or_404
-from django.urls import reverse_lazy
-from django.http import HttpResponse, Http404, JsonResponse
+from django.urls import reverse, reverse_lazy
+from django.http import HttpResponse, HttpResponseBadRequest, Http404, JsonResponse, StreamingHttpResponse
 from dateutil.relativedelta import relativedelta as rd
-from doc.daily_office import DailyOffice
+from dateutil.parser import parse
+from doc import ics
+from doc.decorators import session_free
+from tz_detect.utils import offset_to_timezone
+from doc.daily_office import CALENDAR_VERSION, HOURS, DailyOffice, next_transition, observances, previous_transition, transition_slot
 
 # Create your views here.
 
-def detect(request):
+HOME_CACHE_PREFIX = 'doc:home:'
+ETAG_CACHE_PREFIX = 'doc:etag:'
+CALENDAR_CACHE_PREFIX = 'doc:calendar:'
 
-    return render(request, 'doc/detect.html')
+OFFICE_FIELDS = ('cycle', 'season', 'week', 'day', 'hour')
 
-def home(request):
-    do_yesterday = DailyOffice(now=(timezone.localtime() - rd(days=1)))
-    do_today = DailyOffice(now=timezone.localtime())
-    do_tomorrow = DailyOffice(now=(timezone.localtime() + rd(days=1)))
-
-    context = {
-        'cycle_yesterday': do_yesterday.cycle,
-        'season_yesterday': do_yesterday.season,
-        'week_yesterday': do_yesterday.week,
-        'day_yesterday': do_yesterday.day,
-        'hour_yesterday': do_yesterday.hour,
+# how long a response for an explicit instant may be kept
+FIXED_MAX_AGE = 86400
+
+# the sidebar lists principal feasts, holy days and saints' days, but
+# not Sundays or eves
+SIDEBAR_TIERS = (1, 2, 4, 5)
+SIDEBAR_LENGTH = 5
+
+# calendar pages show each date as it reads at midday
+CALENDAR_TIME = time(12, 0)
+CALENDAR_WEEKS = Calendar(firstweekday=SUNDAY)
+WEEKDAYS = frozenset(day_name)
+
+# the longest range one feed may cover
+ICS_MAX_YEARS = 100
+
+Cell = namedtuple('Cell', 'day classes feast title')
+BLANK = Cell('', '', '', '')
+
+def _expire(response, now, private=True):
+    '''
+    lets clients keep the response until the office at now next changes
+    '''
+    _cache_for(response, _seconds_until_transition(now), private)
+    response['Expires'] = http_date(next_transition(now).timestamp())
+    return response
+
+def _seconds_until_transition(now):
+    return max(int((next_transition(now) - now).total_seconds()), 0)
+
+def _cache_for(response, max_age, private=True):
+    if private:
+        patch_cache_control(response, private=True, max_age=max_age)
+    else:
+        patch_cache_control(response, public=True, max_age=max_age)
+
+def _count(outcome):
+    key = HOME_CACHE_PREFIX + outcome
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+def home_cache_stats():
+    '''
+    returns hits, misses and hit ratio of the rendered-page cache
+    '''
+    hits = cache.get(HOME_CACHE_PREFIX + 'hits', 0)
+    misses = cache.get(HOME_CACHE_PREFIX + 'misses', 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'ratio': hits / total if total else 0.0,
+    }
+
+@lru_cache(maxsize=None)
+def template_digest(*names):
+    '''
+    returns a digest of the calendar version and the sources of the named
+    templates, which changes whenever a page rendered from them may
+    '''
+    digest = hashlib.sha1(str(CALENDAR_VERSION).encode('utf-8'))
+    for name in names:
+        with open(get_template(name).origin.name, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+@staff_member_required
+@never_cache
+@require_safe
+def cache_stats(request):
+    '''
+    the rendered-page cache's hits, misses and hit ratio, for staff; the
+    counters live in the configured cache, so with the default
+    per-process cache they are this process's own
+    '''
+    return JsonResponse(home_cache_stats())
+
+def _office_api_url(moment):
+    '''
+    returns the address of the office at moment as JSON; the time asked
+    for is the canonical hour the moment falls under, which reads the
+    same, so that visitors share the address and caches can keep the
+    answer; a named timezone gets the session-free address of the hour
+    '''
+    start = HOURS[transition_slot(moment)][0]
+    zone = getattr(moment.tzinfo, 'zone', None)
+    if zone:
+        return reverse('doc_office_json', kwargs={'tz': zone, 'day': moment.date(), 'hour': start})
+    params = OrderedDict()
+    params['at'] = '{}T{:%H:%M}'.format(moment.date().isoformat(), start)
+    return '{}?{}'.format(reverse('doc_office_api'), urlencode(params))
+
+def office_context(now):
+    '''
+    returns the template context for the office at now, with the API
+    addresses the page fills the day before and the day after from and
+    the feasts coming up
+    '''
+    do_today = DailyOffice(now=now)
+
+    return {
         'cycle_today': do_today.cycle,
         'season_today': do_today.season,
         'week_today': do_today.week,
         'day_today': do_today.day,
         'hour_today': do_today.hour,
-        'cycle_tomorrow': do_tomorrow.cycle,
-        'season_tomorrow': do_tomorrow.season,
-        'week_tomorrow': do_tomorrow.week,
-        'day_tomorrow': do_tomorrow.day,
-        'hour_tomorrow': do_tomorrow.hour,
-        'timezone': timezone.get_current_timezone(),
+        'yesterday_url': _office_api_url(now - rd(days=1)),
+        'tomorrow_url': _office_api_url(now + rd(days=1)),
+        'upcoming': observances.upcoming(now, SIDEBAR_LENGTH, SIDEBAR_TIERS, evening=False),
+        'timezone': now.tzinfo,
     }
 
-    return render(request, 'doc/home.html', context)
+def _render_office(request, context, ttl):
+    '''
+    renders the office page, keeping the rendered page for ttl seconds
+    keyed by its context
+    '''
+    # until tz_detect has run the page embeds a per-visitor CSRF token
+    if not getattr(request, 'timezone_active', False):
+        return render(request, 'doc/home.html', context)
+
+    state = repr(sorted((name, str(value)) for name, value in context.items()))
+    key = HOME_CACHE_PREFIX + hashlib.sha1(state.encode('utf-8')).hexdigest()
+    content = cache.get(key)
+    if content is not None:
+        _count('hits')
+        response = HttpResponse(content)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    _count('misses')
+    response = render(request, 'doc/home.html', context)
+    if ttl > 0:
+        cache.set(key, response.content, ttl)
+    response['X-Cache'] = 'MISS'
+    return response
+
+@session_free
+@require_safe
+def detect(request):
+    '''
+    the detector page sends the browser back here with the timezone it
+    names, when it can, and its UTC offset in minutes, as
+    Date.getTimezoneOffset gives it; a zone pytz does not know, such as
+    one newer than it, falls back to the offset, and the browser is
+    redirected to the office page of the current hour there
+    '''
+    if 'tz' in request.GET or 'offset' in request.GET:
+        try:
+            tz = pytz.timezone(request.GET.get('tz', ''))
+        except pytz.UnknownTimeZoneError:
+            try:
+                tz = offset_to_timezone(int(request.GET.get('offset', '')))
+            except ValueError:
+                return HttpResponseBadRequest('offset must be a whole number of minutes.')
+        now = timezone.localtime(timezone=tz)
+        hour = HOURS[transition_slot(now)][0]
+        return _expire(redirect('doc_office_hour', tz=tz, day=now.date(), hour=hour), now, private=False)
+
+    response = render(request, 'doc/detect.html')
+    _cache_for(response, FIXED_MAX_AGE, private=False)
+    return response
+
+def home(request):
+    now = timezone.localtime()
+    response = _render_office(request, office_context(now), _seconds_until_transition(now))
+    return _expire(response, now)
+
+@session_free
+@require_safe
+def office(request, tz, day, hour=None):
+    '''
+    the canonical office page for a date in a timezone, at the current
+    time of day there or at one canonical hour; it depends on nothing but
+    its URL, so shared caches may keep it
+    '''
+    if hour is None:
+        # the page follows the time of day in tz, and changes with it
+        current = timezone.localtime(timezone=tz)
+        now = timezone.make_aware(datetime.combine(day, current.time()), tz, is_dst=False)
+        response = _render_office(request, office_context(now), _seconds_until_transition(current))
+        return _expire(response, current, private=False)
+    now = timezone.make_aware(datetime.combine(day, hour), tz, is_dst=False)
+    response = _render_office(request, office_context(now), FIXED_MAX_AGE)
+    _cache_for(response, FIXED_MAX_AGE, private=False)
+    return response
+
+def _office_moment(request):
+    '''
+    returns the local moment asked for by the at and tz parameters; at
+    defaults to now and tz to the detected timezone, and a local time
+    that a clock change skips or repeats is read as standard time
+
+    raises ValueError, with a message for the client, when they do not
+    parse or fall in the first or last year, which lack the calendars
+    either side
+    '''
+    try:
+        if 'tz' in request.GET:
+            tz = pytz.timezone(request.GET['tz'])
+        else:
+            tz = timezone.get_current_timezone()
+        if request.GET.get('at'):
+            moment = parse(request.GET['at'])
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment, tz, is_dst=False)
+        else:
+            moment = timezone.now()
+        moment = timezone.localtime(moment, tz)
+    except (ValueError, OverflowError, KeyError):
+        raise ValueError('at must be a date and time, and tz a timezone name.')
+    if not MINYEAR < moment.year < MAXYEAR:
+        raise ValueError('at must fall from year {} to {}.'.format(MINYEAR + 1, MAXYEAR - 1))
+    return moment
+
+def _office_etag(moment):
+    '''
+    returns the strong ETag of the office at moment; the office only
+    changes between transition slots, so the tag is kept per local date
+    and slot and a repeat poll costs no calendar work
+    '''
+    key = '{}{}:{}:{}'.format(ETAG_CACHE_PREFIX, CALENDAR_VERSION, moment.date().isoformat(), transition_slot(moment))
+    etag = cache.get(key)
+    if etag is None:
+        office = DailyOffice(now=moment)
+        state = tuple(getattr(office, field) for field in OFFICE_FIELDS)
+        etag = quote_etag(hashlib.sha1(repr(state).encode('utf-8')).hexdigest())
+        cache.set(key, etag, FIXED_MAX_AGE)
+    return etag
+
+def _office_json(request, moment):
+    '''
+    answers the office at moment as JSON, or 304 when the client holds it
+    '''
+    etag = _office_etag(moment)
+    last_modified = previous_transition(moment)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=timegm(last_modified.utctimetuple()),
+    )
+    if response is None:
+        office = DailyOffice(now=moment)
+        response = JsonResponse({field: getattr(office, field) for field in OFFICE_FIELDS})
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+@require_safe
+def office_api(request):
+    try:
+        moment = _office_moment(request)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    response = _office_json(request, moment)
+    # without tz the answer depends on the session
+    private = 'tz' not in request.GET
+    if request.GET.get('at'):
+        _cache_for(response, FIXED_MAX_AGE, private)
+    else:
+        _expire(response, moment, private=private)
+    return response
+
+@session_free
+@require_safe
+def office_json(request, tz, day, hour):
+    '''
+    the office at a canonical hour of a date in a timezone as JSON; like
+    the office page it depends on nothing but its URL, so shared caches
+    may keep it
+    '''
+    moment = timezone.make_aware(datetime.combine(day, hour), tz, is_dst=False)
+    response = _office_json(request, moment)
+    _cache_for(response, FIXED_MAX_AGE, private=False)
+    return response
+
+# the few hundred labels a calendar uses are escaped once each
+_label = lru_cache(maxsize=None)(escape)
+
+@lru_cache(maxsize=None)
+def _season_class(season):
+    return slugify(season)
+
+def _calendar_cells(first, end):
+    '''
+    returns a Cell for every date from first up to, but not including,
+    end, resolved in one pass over the cached calendars; cells carry the
+    escaped text the templates print, so rendering one does no work
+    '''
+    cells = {}
+    for office in DailyOffice.iter_range(first, end, at=CALENDAR_TIME):
+        day = office.now.date()
+        classes = _season_class(office.season)
+        if office.day in WEEKDAYS:
+            cells[day] = Cell(day.day, classes, '', _label(office.week))
+        else:
+            feast = _label(office.day)
+            cells[day] = Cell(day.day, classes + ' feast', feast, feast)
+    return cells
+
+def _calendar_weeks(cells, year, month):
+    # dates of the neighbouring months are left blank
+    return [
+        [cells[day] if day.month == month else BLANK for day in week]
+        for week in CALENDAR_WEEKS.monthdatescalendar(year, month)
+    ]
+
+def _calendar_rows(weeks):
+    '''
+    returns the table cells of each week as one piece of markup, sparing
+    the year page the template work of a few hundred cells
+    '''
+    return [
+        mark_safe(''.join('<td class="{}" title="{}">{}</td>'.format(cell.classes, cell.title, cell.day) for cell in week))
+        for week in weeks
+    ]
+
+def _calendar_page(request, template, key, build):
+    '''
+    answers a calendar page, which only changes with the calendar data and
+    the templates: its ETag is their digest, and the rendered page is kept
+    under it so that build only runs for a page not seen since they changed
+    '''
+    etag = quote_etag(hashlib.sha1(
+        '{}:{}'.format(template_digest('doc/base.html', template), key).encode('utf-8')
+    ).hexdigest())
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        content = cache.get(CALENDAR_CACHE_PREFIX + etag)
+        if content is None:
+            content = render(request, template, build()).content
+            cache.set(CALENDAR_CACHE_PREFIX + etag, content, None)
+        response = HttpResponse(content)
+    response['ETag'] = etag
+    _cache_for(response, FIXED_MAX_AGE, private=False)
+    return response
+
+def _check_year(year):
+    # the grids need the years either side of year
+    if not MINYEAR < year < MAXYEAR:
+        raise Http404('No calendar for {}.'.format(year))
+
+@session_free
+@require_safe
+def calendar_month(request, year, month):
+    '''
+    a month's calendar, each date showing its season and any feast
+    '''
+    _check_year(year)
+    if not 1 <= month <= 12:
+        raise Http404('No month {}.'.format(month))
+
+    def build():
+        first = date(year, month, 1)
+        end = first + rd(months=1)
+        previous = first - rd(months=1)
+        return {
+            'month': first,
+            'weeks': _calendar_weeks(_calendar_cells(first, end), year, month),
+            'weekdays': [day_abbr[(SUNDAY + i) % 7] for i in range(7)],
+            'previous': previous if previous.year > MINYEAR else None,
+            'next': end if end.year < MAXYEAR else None,
+        }
+    return _calendar_page(request, 'doc/calendar_month.html', '{}-{}'.format(year, month), build)
+
+@session_free
+@require_safe
+def calendar_year(request, year):
+    '''
+    the overview of a year, its months built from one pass over it
+    '''
+    _check_year(year)
+
+    def build():
+        cells = _calendar_cells(date(year, 1, 1), date(year + 1, 1, 1))
+        months = [
+            {'number': month, 'first': date(year, month, 1), 'rows': _calendar_rows(_calendar_weeks(cells, year, month))}
+            for month in range(1, 13)
+        ]
+        return {
+            'year': year,
+            'months': months,
+            'previous': year - 1 if year - 1 > MINYEAR else None,
+            'next': year + 1 if year + 1 < MAXYEAR else None,
+        }
+    return _calendar_page(request, 'doc/calendar_year.html', year, build)
+
+@session_free
+@require_safe
+def calendar_feed(request):
+    '''
+    the iCalendar feed of the years from first to last, this year and the
+    next by default, with each canonical hour when hours is given; the
+    feed is streamed a year at a time, and its ETag is known before any
+    of it is generated, so a subscriber polling an unchanged feed costs
+    nothing
+    '''
+    this_year = timezone.now().year
+    try:
+        first = int(request.GET.get('first', this_year))
+        last = int(request.GET.get('last', max(first, this_year) + 1))
+    except ValueError:
+        return HttpResponseBadRequest('first and last must be years.')
+    if not MINYEAR < first <= last < MAXYEAR or last - first >= ICS_MAX_YEARS:
+        return HttpResponseBadRequest('first and last must be years in order, at most {} apart.'.format(ICS_MAX_YEARS))
+    hours = request.GET.get('hours') not in (None, '', '0')
+
+    state = '{}:{}:{}:{}:{}'.format(ics.FEED_VERSION, CALENDAR_VERSION, first, last, hours)
+    etag = quote_etag(hashlib.sha1(state.encode('utf-8')).hexdigest())
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = StreamingHttpResponse(ics.feed(first, last, hours), content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = 'inline; filename="daily-office-{}-{}.ics"'.format(first, last)
+    response['ETag'] = etag
+    _cache_for(response, FIXED_MAX_AGE, private=False)
+    return response
@@ -41,15 +41,18 @@ INSTALLED_APPS = [
     'tz_detect',
 ]
 
+# views marked session_free are answered by SessionFreeMiddleware and
+# skip everything listed after it
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'doc.middleware.SessionFreeMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'tz_detect.middleware.TimezoneMiddleware',
+    'doc.middleware.TimezoneMiddleware',
 ]
 
 ROOT_URLCONF = 'docsite.urls'
@@ -125,4 +128,11 @@ STATIC_URL = '/static/'
 
 LOGIN_REDIRECT_URL = '/'
 
+# Prebuilt office table (python manage.py build_office_table); used when present
+OFFICE_TABLE = os.path.join(BASE_DIR, 'office_table.bin')
+
+# Static copies of the office pages (python manage.py pregenerate), laid
+# out by URL so a web server can answer /office/... before Django
+OFFICE_SITE_ROOT = os.path.join(BASE_DIR, 'site')
+
 # SECURE_SSL_REDIRECT = True
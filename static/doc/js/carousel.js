@@ -0,0 +1,19 @@
+// only today's slide is rendered with the page; the others are filled in
+// from the office JSON once the page has loaded
+window.addEventListener("load", function () {
+  var slides = document.querySelectorAll("[data-office-url]");
+  Array.prototype.forEach.call(slides, function (slide) {
+    var request = new XMLHttpRequest();
+    request.open("GET", slide.getAttribute("data-office-url"));
+    request.onload = function () {
+      if (request.status !== 200) {
+        return;
+      }
+      var office = JSON.parse(request.responseText);
+      Array.prototype.forEach.call(slide.querySelectorAll("[data-field]"), function (field) {
+        field.textContent = office[field.getAttribute("data-field")];
+      });
+    };
+    request.send();
+  });
+});